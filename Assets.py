@@ -0,0 +1,227 @@
+# Assets.py
+from os.path import join, splitext
+import os
+import threading
+import pygame
+
+ASSETS_PATH = "assets"
+IMAGE_EXTENSIONS = (".png",)
+SOUND_EXTENSIONS = (".mp3", ".wav", ".ogg")
+
+# Sprites in assets/ face north; rotation needed for each driving direction
+DIRECTION_ANGLES = {"N": 0, "S": 180, "E": -90, "W": 90}
+
+CARS_PATH = join(ASSETS_PATH, "cars")
+HORNS_PATH = join(ASSETS_PATH, "sound", "horns")
+SIREN_PATH = join(ASSETS_PATH, "sound", "siren", "police-siren.mp3")
+PEDESTRIANS_PATH = join(ASSETS_PATH, "pedestrians")
+PEDESTRIAN_STATES = ("idle", "left_foot", "right_foot")
+PEDESTRIAN_SCALE = 0.045
+TRAFFIC_LIGHTS_PATH = join(ASSETS_PATH, "trafficlight")
+TRAFFIC_LIGHT_FILES = {"red": "REDtraffic.png", "yellow": "YELLOWtraffic.png", "green": "GREENtraffic.png"}
+TRAFFIC_LIGHT_SCALE = 0.07
+# Light images face south; rotation for the light of each approach
+TRAFFIC_LIGHT_ANGLES = {"N": 180, "S": 0, "E": -90, "W": 90}
+
+# Decoded files by path: Surfaces (not converted for the display yet) and Sounds.
+# Filled by the Preloader's worker thread, or on first use.
+_files = {}
+
+# Sizes the simulation needs, read without a display (see get_car_catalog)
+_car_catalog = None      # [[(file name, (width, height) facing north), ...] per category]
+_pedestrian_size = None  # (width, height) of a north-facing pedestrian
+
+# Process-wide registry, filled once by load_all()
+_car_models = None    # category -> list of {'name': file name, 'images': {direction: surface}}
+_horn_sounds = None   # list of decoded horn sounds
+_siren_sound = None   # decoded siren sound (or None)
+_pedestrian_frames = None  # (direction, animation_state) -> surface
+_traffic_lights = None     # direction -> {color: surface}
+
+
+def _decode(path):
+    if splitext(path)[1].lower() in SOUND_EXTENSIONS:
+        return pygame.mixer.Sound(path)
+    return pygame.image.load(path)
+
+
+def surface(path):
+    """Decoded image at path (preloaded if possible), not converted for the display"""
+    image = _files.get(path)
+    if image is None:
+        image = _files[path] = _decode(path)
+    return image
+
+
+class Preloader:
+    """
+    Decodes every image and sound under assets/ in a worker thread while the menu is shown.
+    Surfaces can only be converted for the display on the main thread: finish() does that
+    (through load_all) once the worker is done, after which a run never reads the disk.
+    """
+    def __init__(self, root=ASSETS_PATH):
+        extensions = IMAGE_EXTENSIONS + (SOUND_EXTENSIONS if pygame.mixer.get_init() else ())
+        self.paths = sorted(join(folder, name)
+                            for folder, _, names in os.walk(root)
+                            for name in names if splitext(name)[1].lower() in extensions)
+        self.loaded = 0         # files decoded so far
+        self.resident = False   # finish() has run
+        self._thread = threading.Thread(target=self._run, name="asset-preloader", daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def _run(self):
+        for path in self.paths:
+            if path not in _files:
+                try:
+                    _files[path] = _decode(path)
+                except Exception:
+                    pass  # decoded again on first use, where the error is reported
+            self.loaded += 1
+
+    def progress(self):
+        """Fraction of the files decoded"""
+        return self.loaded / len(self.paths) if self.paths else 1.0
+
+    def decoded(self):
+        return self.loaded == len(self.paths)
+
+    def finish(self):
+        """Wait for the worker, then convert everything the viewer draws (main thread only)"""
+        self._thread.join()
+        load_all()
+        self.resident = True
+
+
+def get_car_catalog():
+    """
+    Return the car models as [[(file name, (width, height) facing north), ...] per category],
+    categories and models in the same order as get_car_models(). Needs no display mode.
+    """
+    global _car_catalog
+    if _car_catalog is None:
+        _car_catalog = [
+            [(name, surface(join(CARS_PATH, category, name)).get_size())
+             for name in sorted(os.listdir(join(CARS_PATH, category)))]
+            for category in sorted(os.listdir(CARS_PATH))
+        ]
+    return _car_catalog
+
+
+def get_pedestrian_size():
+    """(width, height) of a north-facing pedestrian frame. Needs no display mode."""
+    global _pedestrian_size
+    if _pedestrian_size is None:
+        image = surface(join(PEDESTRIANS_PATH, "idle.png"))
+        _pedestrian_size = pygame.transform.scale_by(image, PEDESTRIAN_SCALE).get_size()
+    return _pedestrian_size
+
+
+def _load_car_models():
+    models = {}
+    for category in sorted(os.listdir(CARS_PATH)):
+        category_path = join(CARS_PATH, category)
+        models[category] = []
+        for name in sorted(os.listdir(category_path)):
+            image = surface(join(category_path, name)).convert_alpha()
+            images = {d: pygame.transform.rotate(image, angle) for d, angle in DIRECTION_ANGLES.items()}
+            models[category].append({"name": name, "images": images})
+    return models
+
+
+def _load_pedestrian_frames():
+    frames = {}
+    for state in PEDESTRIAN_STATES:
+        image = surface(join(PEDESTRIANS_PATH, f"{state}.png")).convert_alpha()
+        image = pygame.transform.scale_by(image, PEDESTRIAN_SCALE)
+        for d, angle in DIRECTION_ANGLES.items():
+            frames[(d, state)] = pygame.transform.rotate(image, angle)
+    return frames
+
+
+def _load_traffic_lights():
+    lights = {}
+    images = {}
+    for color, name in TRAFFIC_LIGHT_FILES.items():
+        image = surface(join(TRAFFIC_LIGHTS_PATH, name))
+        if pygame.display.get_surface():
+            image = image.convert_alpha()  # headless runs only need the sizes: no display to convert for
+        images[color] = pygame.transform.scale_by(image, TRAFFIC_LIGHT_SCALE)
+    for d, angle in TRAFFIC_LIGHT_ANGLES.items():
+        lights[d] = {color: pygame.transform.rotate(image, angle) if angle else image
+                     for color, image in images.items()}
+    return lights
+
+
+def _load_sound(path, volume):
+    """Decode a sound once; returns None when the mixer is unavailable"""
+    if not pygame.mixer.get_init():
+        return None
+    try:
+        sound = _files.get(path)
+        if sound is None:
+            sound = _decode(path)
+    except Exception as e:
+        print(f"Sound not loaded ({path}): {e}")
+        return None
+    sound.set_volume(volume)
+    return sound
+
+
+def _load_horns():
+    horns = []
+    for name in sorted(os.listdir(HORNS_PATH)):
+        sound = _load_sound(join(HORNS_PATH, name), 0.2)
+        if sound:
+            horns.append(sound)
+    return horns
+
+
+def load_all():
+    """Decode (unless preloaded) and convert every car/pedestrian/light image and sound once. Needs a display mode."""
+    global _car_models, _horn_sounds, _siren_sound, _pedestrian_frames, _traffic_lights
+    if _car_models is None:
+        _car_models = _load_car_models()
+    if _pedestrian_frames is None:
+        _pedestrian_frames = _load_pedestrian_frames()
+    if _traffic_lights is None:
+        _traffic_lights = _load_traffic_lights()
+    if _horn_sounds is None:
+        _horn_sounds = _load_horns()
+        _siren_sound = _load_sound(SIREN_PATH, 0.3)
+
+
+def get_car_models():
+    """Return {category: [model, ...]} with each model pre-rotated for N/S/E/W"""
+    if _car_models is None:
+        load_all()
+    return _car_models
+
+
+def get_horn_sounds():
+    if _horn_sounds is None:
+        load_all()
+    return _horn_sounds
+
+
+def get_siren_sound():
+    if _horn_sounds is None:
+        load_all()
+    return _siren_sound
+
+
+def get_pedestrian_frames():
+    """Return {(direction, animation_state): surface}, scaled and rotated once"""
+    if _pedestrian_frames is None:
+        load_all()
+    return _pedestrian_frames
+
+
+def get_traffic_light_images(direction):
+    """Return {color: surface} for the light of an approach, scaled and rotated once"""
+    global _traffic_lights
+    if _traffic_lights is None:
+        _traffic_lights = _load_traffic_lights()  # headless runs need the lights, not the sprites
+    return _traffic_lights[direction]
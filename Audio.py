@@ -0,0 +1,137 @@
+# Audio.py
+# Vehicle horns and sirens: the Simulation reports them, an audio backend decides what is heard.
+import math
+import pygame
+import Assets
+
+
+class AudioManager:
+    """
+    Plays horns and sirens on a fixed pool of mixer channels, from sounds decoded once by Assets.
+    Only the max_sirens emergency vehicles closest to the listener get a siren voice; horns take
+    whatever voice is free and are dropped when none is (a siren cuts a horn short if it has to).
+    Every voice is attenuated and panned by the vehicle's distance to the listener.
+    """
+    def __init__(self, listener, channels=6, max_sirens=2, near=80.0, far=600.0):
+        """
+        listener   = (x, y) the sounds are heard from, in simulation pixels (the screen center)
+        channels   = mixer channels reserved for vehicles (the voice limit)
+        max_sirens = sirens heard at once, nearest first
+        near, far  = full volume up to near pixels, fading out to silence at far
+        """
+        self.listener = listener
+        self.max_sirens = max_sirens
+        self.near = near
+        self.far = far
+        self.horns = Assets.get_horn_sounds()
+        self.siren = Assets.get_siren_sound()
+
+        self.channels = []
+        if pygame.mixer.get_init():
+            # reserved: Sound.play() elsewhere can never steal a vehicle's channel
+            pygame.mixer.set_num_channels(max(pygame.mixer.get_num_channels(), channels))
+            pygame.mixer.set_reserved(channels)
+            self.channels = [pygame.mixer.Channel(i) for i in range(channels)]
+
+        self._sirens = {}  # id(car) -> emergency car whose siren is on (heard or not)
+        self._voices = {}  # id(car) -> channel playing that car's siren
+
+    def _gains(self, car):
+        """(left, right) channel volumes for a sound coming from car"""
+        dx = car.rect.centerx - self.listener[0]
+        dy = car.rect.centery - self.listener[1]
+        distance = math.hypot(dx, dy)
+        if distance <= self.near:
+            volume = 1.0
+        else:
+            volume = max(0.0, 1.0 - (distance - self.near) / (self.far - self.near))
+        pan = max(-1.0, min(1.0, dx / self.far))  # -1: all left, 1: all right
+        return volume * min(1.0, 1.0 - pan), volume * min(1.0, 1.0 + pan)
+
+    def _free_channel(self):
+        for channel in self.channels:
+            if not channel.get_busy():
+                return channel
+        return None
+
+    def _horn_channel(self):
+        """A channel playing a horn, to be cut short for a siren"""
+        sirens = self._voices.values()
+        for channel in self.channels:
+            if channel not in sirens:
+                return channel
+        return None
+
+    def horn(self, car):
+        if not self.horns:
+            return
+        left, right = self._gains(car)
+        if left == right == 0.0:
+            return  # too far to be heard
+        channel = self._free_channel()
+        if channel is None:
+            return  # voice limit reached
+        # each car keeps one horn, picked from its vehicle id
+        channel.play(self.horns[car.vehicle_id % len(self.horns)])
+        channel.set_volume(left, right)
+
+    def siren_on(self, car):
+        if self.siren:
+            self._sirens[id(car)] = car
+
+    def siren_off(self, car):
+        self._sirens.pop(id(car), None)
+        channel = self._voices.pop(id(car), None)
+        if channel:
+            channel.stop()
+
+    def update(self):
+        """Once per frame: hand the siren voices to the closest emergency vehicles and follow them"""
+        if not self._sirens and not self._voices:
+            return
+        sirens = self._sirens
+        listener_x, listener_y = self.listener
+        closest = sorted(sirens, key=lambda key: math.hypot(sirens[key].rect.centerx - listener_x,
+                                                           sirens[key].rect.centery - listener_y))
+        heard = set(closest[:self.max_sirens])
+
+        for key in [key for key in self._voices if key not in heard]:
+            self._voices.pop(key).stop()
+
+        for key in closest[:self.max_sirens]:
+            channel = self._voices.get(key)
+            if channel is None:
+                channel = self._free_channel() or self._horn_channel()
+                if channel is None:
+                    continue
+                channel.play(self.siren, loops=-1)
+                self._voices[key] = channel
+            channel.set_volume(*self._gains(sirens[key]))
+
+    def stop_all(self):
+        for channel in self.channels:
+            channel.stop()
+        self._sirens.clear()
+        self._voices.clear()
+
+
+class NullAudio:
+    """Audio backend for headless runs: nobody is listening, so every call does nothing."""
+    def horn(self, car):
+        pass
+
+    def siren_on(self, car):
+        pass
+
+    def siren_off(self, car):
+        pass
+
+    def update(self):
+        pass
+
+    def stop_all(self):
+        pass
+
+
+# Shared default for simulations created without an audio backend
+NULL_AUDIO = NullAudio()
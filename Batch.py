@@ -0,0 +1,91 @@
+# Batch.py
+# Monte Carlo studies: N seeded headless replicates for every combination of menu settings.
+import argparse
+import itertools
+import json
+import math
+import os
+import statistics
+from concurrent.futures import ProcessPoolExecutor
+
+import Settings
+import Simulation
+
+METRICS = ("cars_crossed", "peds_crossed", "avg_car_wait")
+
+# Two-sided 95% Student t critical values by degrees of freedom (normal value beyond 30)
+T_95 = {1: 12.706, 2: 4.303, 3: 3.182, 4: 2.776, 5: 2.571, 6: 2.447, 7: 2.365, 8: 2.306,
+        9: 2.262, 10: 2.228, 12: 2.179, 15: 2.131, 20: 2.086, 25: 2.060, 30: 2.042}
+
+
+def settings_grid(options=Settings.OPTIONS):
+    """Every combination of the menu options, as USER_SETTINGS-style dicts"""
+    keys = list(options)
+    return [dict(zip(keys, values)) for values in itertools.product(*(options[k] for k in keys))]
+
+
+def t_critical(df):
+    if df > 30:
+        return 1.96
+    # closest tabulated df at or below (conservative)
+    return T_95[max(k for k in T_95 if k <= df)]
+
+
+def summarize(values):
+    """Mean, standard deviation and 95% confidence interval of the mean"""
+    n = len(values)
+    mean = statistics.fmean(values)
+    std = statistics.stdev(values) if n > 1 else 0.0
+    half = t_critical(n - 1) * std / math.sqrt(n) if n > 1 else 0.0
+    return {"mean": mean, "std": std, "ci95": [mean - half, mean + half]}
+
+
+def run_replicate(job):
+    """Worker: one headless run of one settings combination with one seed"""
+    settings, seed, duration, dt = job
+    config = Settings.build_config(settings)
+    stats = Simulation.run_headless(config, duration, dt=dt, seed=seed)
+    return settings, seed, stats
+
+
+def run_batch(replicates, duration, dt=1 / 60, base_seed=0, workers=None, grid=None):
+    """Run every replicate of every combination on a process pool and aggregate the stats"""
+    grid = grid if grid is not None else settings_grid()
+    # same seeds for every combination (common random numbers)
+    jobs = [(settings, base_seed + r, duration, dt) for settings in grid for r in range(replicates)]
+
+    runs = {}
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as pool:
+        for settings, seed, stats in pool.map(run_replicate, jobs, chunksize=max(1, len(jobs) // 64)):
+            runs.setdefault(tuple(settings.items()), []).append(stats)
+
+    results = []
+    for settings in grid:
+        stats_list = runs[tuple(settings.items())]
+        row = {"settings": settings, "replicates": len(stats_list)}
+        for metric in METRICS:
+            row[metric] = summarize([s[metric] for s in stats_list])
+        results.append(row)
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run seeded headless replicates over the settings grid")
+    parser.add_argument("--replicates", type=int, default=10, help="runs per settings combination")
+    parser.add_argument("--duration", type=float, default=600, help="simulated seconds per run")
+    parser.add_argument("--dt", type=float, default=1 / 60, help="seconds per tick")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the first replicate")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: all cores)")
+    parser.add_argument("--out", default=os.path.join(Settings.OUTPUT_DIR, "batch_results.json"), help="results file (JSON)")
+    args = parser.parse_args(argv)
+
+    results = run_batch(args.replicates, args.duration, dt=args.dt, base_seed=args.seed, workers=args.workers)
+    os.makedirs(os.path.dirname(args.out) or ".", exist_ok=True)
+    with open(args.out, "w") as f:
+        json.dump({"replicates": args.replicates, "duration": args.duration, "dt": args.dt,
+                   "seed": args.seed, "results": results}, f, indent=2)
+    print(f"Wrote {len(results)} settings combinations to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,266 @@
+# Benchmark.py
+# Fixed, seeded scenarios timed tick by tick: update (engine) and render (SDL dummy driver) phases,
+# spawn cost and peak memory. Results go to JSON so two runs can be compared.
+import argparse
+import json
+import math
+import multiprocessing
+import os
+import platform
+import statistics
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+from os.path import join
+
+import pygame
+import Assets
+import Car
+import Settings
+import Simulation
+from Environment import WeatherRenderer
+from Renderer import SceneRenderer
+
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
+
+RUSH_HOUR_CHAOTIC = {"traffic": "Rush Hour", "driving": "Aggressive", "pedestrians": "Busy", "weather": "Chaotic"}
+
+# settings      = menu settings the CONFIG is built from
+# time_of_day   = pinned for the whole run (None lets the weather system decide)
+# cars          = cars queued on the four approaches before the first tick
+# ticks         = ticks timed (at 60 ticks per simulated second)
+# budget_ms     = per-tick targets; update + render must fit a 16.7 ms frame
+SCENARIOS = {
+    "normal_day": {
+        "settings": Settings.DEFAULT_SETTINGS, "time_of_day": "day", "cars": 0, "ticks": 1800,
+        "budget_ms": {"update": 2.0, "render": 6.0},
+    },
+    "rush_hour_chaotic_night": {
+        "settings": RUSH_HOUR_CHAOTIC, "time_of_day": "night", "cars": 0, "ticks": 3600,
+        "budget_ms": {"update": 3.0, "render": 10.0},
+    },
+    "cars_200": {
+        "settings": Settings.DEFAULT_SETTINGS, "time_of_day": "day", "cars": 200, "ticks": 600,
+        "budget_ms": {"update": 6.0, "render": 8.0},
+    },
+    "cars_1000": {
+        "settings": Settings.DEFAULT_SETTINGS, "time_of_day": "day", "cars": 1000, "ticks": 300,
+        "budget_ms": {"update": 25.0, "render": 25.0},
+    },
+}
+
+LANE_GAP = 90        # px between queued cars (the longest car is 78 px)
+SPAWN_SAMPLES = 500  # Car/Pedestrian constructions timed for the spawn cost
+
+
+def _world_size(base, cars):
+    """Intersection size, grown so cars/4 queued cars fit on each approach"""
+    per_lane = math.ceil(cars / 4)
+    return max(base, 2 * (per_lane * LANE_GAP + 200))
+
+
+def _fill_lanes(sim, count):
+    """Queue count cars on the four approaches, front car 200 px before the center"""
+    config = sim.config
+    w, h = sim.window_width, sim.window_height
+    for k in range(math.ceil(count / 4)):
+        offset = 200 + k * LANE_GAP
+        for direction in ("N", "S", "E", "W")[:count - 4 * k]:
+            speed = sim.rng.uniform(config["car_speed_min"], config["car_speed_max"])
+            car = Car.Car(w, h, speed, direction, clock=sim.clock, rng=sim.rng)
+            if direction == "S":
+                car.rect.centery = h / 2 - offset
+            elif direction == "N":
+                car.rect.centery = h / 2 + offset
+            elif direction == "E":
+                car.rect.centerx = w / 2 - offset
+            else:
+                car.rect.centerx = w / 2 + offset
+            sim.add_car(car)
+
+
+def _pin_time_of_day(weather_system, time_of_day):
+    """Keep the weather system on one time of day while rain and fog still change"""
+    randomize = weather_system.randomize_targets
+
+    def pinned():
+        randomize()
+        weather_system.target_time = time_of_day
+
+    weather_system.randomize_targets = pinned
+    weather_system.target_time = weather_system.env.time_of_day = time_of_day
+    weather_system.env.recompute()
+
+
+def _setup(spec, backend, seed):
+    """Seeded simulation plus the same renderers run_simulation uses"""
+    base_width, base_height = Simulation.init_headless()
+    world = _world_size(max(base_width, base_height), spec["cars"])
+
+    # Sprites outside the view are clipped by SDL, as in the viewer
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    pygame.display.init()
+    display = pygame.display.set_mode((base_width, base_height))
+    background = Assets.surface(join('assets', 'intersection.png'))
+
+    config = Settings.build_config(spec["settings"])
+    sim = Simulation.Simulation(world, world, config, verbose=False, backend=backend, seed=seed)
+    if spec["time_of_day"]:
+        _pin_time_of_day(sim.weather_system, spec["time_of_day"])
+    _fill_lanes(sim, spec["cars"])
+
+    renderer = SceneRenderer(display, background, sim.sim_data)
+    weather_fx = WeatherRenderer(base_width, base_height)
+    return sim, renderer, weather_fx
+
+
+def _run(sim, renderer, weather_fx, ticks, dt, timings=None):
+    """Step and draw ticks frames; appends (update_s, render_s, cars, cars on screen) per tick to timings"""
+    perf = time.perf_counter
+    # The crowd worlds are far larger than the display: render time covers only the visible window
+    view = renderer.display.get_rect()
+    for _ in range(ticks):
+        t0 = perf()
+        env = sim.step(dt)
+        t1 = perf()
+        sim.sync_sprites()
+        renderer.draw(sim.cars, sim.pedestrians, env, weather_fx)
+        t2 = perf()
+        if timings is not None:
+            on_screen = sum(1 for car in sim.cars if view.colliderect(car.rect))
+            timings.append((t1 - t0, t2 - t1, len(sim.cars), on_screen))
+    sim.finish()
+
+
+def _spawn_cost(config, samples=SPAWN_SAMPLES):
+    """Mean microseconds to build one car and one pedestrian through the spawners"""
+    w, h = Simulation.init_headless()
+    perf = time.perf_counter
+
+    # untimed warm-up: the first spawn of each kind loads the car catalog and pedestrian size
+    Simulation.spawn_random_car(w, h, config)
+    Simulation.spawn_test_pedestrian(w, h, config)
+
+    t0 = perf()
+    cars = [Simulation.spawn_random_car(w, h, config) for _ in range(samples)]
+    t1 = perf()
+    peds = [Simulation.spawn_test_pedestrian(w, h, config) for _ in range(samples)]
+    t2 = perf()
+
+    del cars, peds
+    return {"car": (t1 - t0) / samples * 1e6, "pedestrian": (t2 - t1) / samples * 1e6}
+
+
+def _summary_ms(seconds):
+    ms = [s * 1000 for s in seconds]
+    q = statistics.quantiles(ms, n=100) if len(ms) > 1 else ms * 99
+    return {"mean": statistics.fmean(ms), "p50": q[49], "p95": q[94], "p99": q[98], "max": max(ms)}
+
+
+def run_scenario(job):
+    """Worker: time one scenario in a fresh process (so peak RSS belongs to it alone)"""
+    name, backend, seed, dt = job
+    spec = SCENARIOS[name]
+
+    spawn_us = _spawn_cost(Settings.build_config(spec["settings"]))
+
+    timings = []
+    sim, renderer, weather_fx = _setup(spec, backend, seed)
+    _run(sim, renderer, weather_fx, spec["ticks"], dt, timings)
+    world = sim.window_width
+
+    # Same run again under tracemalloc (too slow to time with it on)
+    tracemalloc.start()
+    sim, renderer, weather_fx = _setup(spec, backend, seed)
+    _run(sim, renderer, weather_fx, spec["ticks"], dt)
+    peak_traced = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    update_ms = _summary_ms([t[0] for t in timings])
+    render_ms = _summary_ms([t[1] for t in timings])
+    car_counts = [t[2] for t in timings]
+    on_screen = [t[3] for t in timings]
+    budget = spec["budget_ms"]
+
+    peak_rss_mb = None
+    if resource is not None:
+        # kilobytes on Linux, bytes on macOS
+        scale = 1024 * 1024 if platform.system() == "Darwin" else 1024
+        peak_rss_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / scale
+
+    return name, {
+        "settings": spec["settings"], "time_of_day": spec["time_of_day"], "backend": backend,
+        "seed": seed, "ticks": spec["ticks"], "world": world,
+        "cars": {"prefilled": spec["cars"], "mean": statistics.fmean(car_counts), "peak": max(car_counts),
+                 "on_screen_mean": statistics.fmean(on_screen), "on_screen_peak": max(on_screen)},
+        "update_ms": update_ms, "render_ms": render_ms, "budget_ms": budget,
+        "within_budget": {"update": update_ms["p95"] <= budget["update"],
+                          "render": render_ms["p95"] <= budget["render"]},
+        "spawn_us": spawn_us,
+        "peak_traced_mb": peak_traced / (1024 * 1024),
+        "peak_rss_mb": peak_rss_mb,
+    }
+
+
+def run_benchmarks(names, backend="objects", seed=0, dt=1 / 60):
+    """Run each scenario in its own spawned process, one after the other"""
+    results = {}
+    context = multiprocessing.get_context("spawn")
+    for name in names:
+        with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+            name, result = pool.submit(run_scenario, (name, backend, seed, dt)).result()
+        results[name] = result
+    return results
+
+
+def compare(old, new):
+    """Print the p50/p95 change of every phase for the scenarios both runs share"""
+    for name, result in new["scenarios"].items():
+        before = old["scenarios"].get(name)
+        if not before:
+            continue
+        print(name)
+        for phase in ("update_ms", "render_ms"):
+            for stat in ("p50", "p95"):
+                a, b = before[phase][stat], result[phase][stat]
+                change = (b - a) / a * 100 if a else 0.0
+                print(f"  {phase[:-3]:6} {stat}: {a:8.3f} -> {b:8.3f} ms ({change:+.1f}%)")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Time the standard scenarios tick by tick")
+    parser.add_argument("--scenarios", nargs="+", choices=list(SCENARIOS), default=list(SCENARIOS))
+    parser.add_argument("--backend", choices=["objects", "vector"], default="objects")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--dt", type=float, default=1 / 60, help="seconds per tick")
+    parser.add_argument("--out", default=join(Settings.OUTPUT_DIR, "benchmark_results.json"), help="results file (JSON)")
+    parser.add_argument("--compare", metavar="JSON", help="earlier results file to compare against")
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(args.scenarios, backend=args.backend, seed=args.seed, dt=args.dt)
+    report = {
+        "python": platform.python_version(), "pygame": pygame.version.ver,
+        "machine": platform.machine(), "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "scenarios": results,
+    }
+    os.makedirs(os.path.dirname(args.out) or ".", exist_ok=True)
+    with open(args.out, "w") as f:
+        json.dump(report, f, indent=2)
+
+    for name, r in results.items():
+        ok = "ok" if all(r["within_budget"].values()) else "OVER BUDGET"
+        print(f"{name:24} update p95 {r['update_ms']['p95']:7.3f} ms  render p95 {r['render_ms']['p95']:7.3f} ms"
+              f" ({r['cars']['on_screen_mean']:.0f}/{r['cars']['mean']:.0f} cars on screen)"
+              f"  peak {r['peak_traced_mb']:6.1f} MB traced  [{ok}]")
+    print(f"Wrote {len(results)} scenarios to {args.out}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            compare(json.load(f), report)
+
+
+if __name__ == "__main__":
+    main()
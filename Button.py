@@ -1,3 +1,12 @@
+import functools
+
+
+@functools.lru_cache(maxsize=256)
+def render_text(font, text, color):
+	"""Render text once per (font, text, color); fonts come from a per-size cache, so font ~ size"""
+	return font.render(text, True, color)
+
+
 class Button():
 	def __init__(self, image, pos, text_input, font, base_color, hovering_color):
 		self.image = image
@@ -6,7 +15,8 @@ class Button():
 		self.font = font
 		self.base_color, self.hovering_color = base_color, hovering_color
 		self.text_input = text_input
-		self.text = self.font.render(self.text_input, True, self.base_color)
+		self.hovered = False
+		self.text = render_text(self.font, self.text_input, self.base_color)
 		if self.image is None:
 			self.image = self.text
 		self.rect = self.image.get_rect(center=(self.x_pos, self.y_pos))
@@ -15,7 +25,7 @@ class Button():
 	def update(self, screen):
 		if self.image is not None:
 			screen.blit(self.image, self.rect)
-		screen.blit(self.text, self.text_rect)
+		return screen.blit(self.text, self.text_rect).union(self.rect)
 
 	def checkForInput(self, position):
 		if position[0] in range(self.rect.left, self.rect.right) and position[1] in range(self.rect.top, self.rect.bottom):
@@ -23,7 +33,9 @@ class Button():
 		return False
 
 	def changeColor(self, position):
-		if position[0] in range(self.rect.left, self.rect.right) and position[1] in range(self.rect.top, self.rect.bottom):
-			self.text = self.font.render(self.text_input, True, self.hovering_color)
-		else:
-			self.text = self.font.render(self.text_input, True, self.base_color)
\ No newline at end of file
+		hovered = self.checkForInput(position)
+		# only re-render when the hover state flips
+		if hovered == self.hovered:
+			return
+		self.hovered = hovered
+		self.text = render_text(self.font, self.text_input, self.hovering_color if hovered else self.base_color)
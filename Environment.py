@@ -32,35 +32,83 @@ class EnvironmentState:
 
 class WeatherRenderer:
     """Pure visuals: rain drops + fog + night tint."""
-    def __init__(self, w, h):
+    TINTS = {"dusk": (10, 5, 0, 60), "night": (0, 0, 20, 110)}
+    RAIN_COLOR = (180, 180, 255)
+
+    def __init__(self, w, h, max_drops=180, rain_levels=12):
+        """
+        max_drops   = number of rain streaks at full intensity
+        rain_levels = how many intensity steps the rain texture is redrawn at
+        """
         self.w, self.h = w, h
-        self._fog_surface = pygame.Surface((w, h), pygame.SRCALPHA)
-        self._tint_surface = pygame.Surface((w, h), pygame.SRCALPHA)
-        self._rain_drops = [(random.randrange(0, w), random.randrange(0, h), random.randrange(8, 18)) for _ in range(180)]
+        self.max_drops = max_drops
+        self._rain_step = max(1, max_drops // rain_levels)
+        self._rain_drops = [(random.randrange(0, w), random.randrange(0, h), random.randrange(8, 18)) for _ in range(max_drops)]
+
+        # Tint and fog composited into one layer, rebuilt only when they change
+        self._overlay = pygame.Surface((w, h), pygame.SRCALPHA)
+        self._overlay_key = None
+
+        # Rain texture (colorkeyed), scrolled every frame and redrawn only when the drop count changes
+        self._rain_surface = pygame.Surface((w, h))
+        self._rain_surface.set_colorkey((0, 0, 0), pygame.RLEACCEL)
+        self._rain_count = None
+        self._rain_x = 0
+        self._rain_y = 0
+
+    @staticmethod
+    def _over(top, bottom):
+        """RGBA of top drawn over bottom, so one blit equals two blits in a row"""
+        ta, ba = top[3] / 255, bottom[3] / 255
+        a = ta + ba * (1 - ta)
+        if a == 0:
+            return (0, 0, 0, 0)
+        rgb = [round((t * ta + b * ba * (1 - ta)) / a) for t, b in zip(top[:3], bottom[:3])]
+        return (*rgb, round(a * 255))
+
+    def _update_overlay(self, env):
+        fog_alpha = int(160 * env.fog) if env.fog > 0 else 0
+        key = (env.time_of_day, fog_alpha)
+        if key == self._overlay_key:
+            return
+        self._overlay_key = key
+
+        # Night / dusk tint, then fog overlay (gray alpha) on top of it
+        color = self.TINTS.get(env.time_of_day, (0, 0, 0, 0))
+        if fog_alpha:
+            color = self._over((200, 200, 200, fog_alpha), color)
+        self._overlay.fill(color)
+
+    def _update_rain_texture(self, count):
+        if count == self._rain_count:
+            return
+        self._rain_count = count
+        self._rain_surface.fill((0, 0, 0))
+        for x, y, length in self._rain_drops[:count]:
+            pygame.draw.line(self._rain_surface, self.RAIN_COLOR, (x, y), (x, y + length), 1)
+
+    def _rain_streaks(self, env: EnvironmentState):
+        """Streaks drawn for env's rain: scales with intensity, quantized to the texture's steps"""
+        count = int(self.max_drops * env.rain)
+        return count - count % self._rain_step
+
+    def covers_screen(self, env: EnvironmentState):
+        """True when draw() paints over the whole screen (tint, fog or rain)"""
+        return env.time_of_day in self.TINTS or int(160 * env.fog) > 0 or self._rain_streaks(env) > 0
 
     def draw(self, screen, env: EnvironmentState):
-        # Night / dusk tint
-        self._tint_surface.fill((0, 0, 0, 0))
-        if env.time_of_day == "dusk":
-            self._tint_surface.fill((10, 5, 0, 60))
-            screen.blit(self._tint_surface, (0, 0))
-        elif env.time_of_day == "night":
-            self._tint_surface.fill((0, 0, 20, 110))
-            screen.blit(self._tint_surface, (0, 0))
-
-        # Fog overlay (gray alpha)
-        if env.fog > 0:
-            self._fog_surface.fill((200, 200, 200, int(160 * env.fog)))
-            screen.blit(self._fog_surface, (0, 0))
-
-        # Rain (simple streaks)
-        if env.rain > 0:
-            # number of streaks scales with intensity
-            count = int(len(self._rain_drops) * env.rain)
-            for i in range(count):
-                x, y, length = self._rain_drops[i]
-                pygame.draw.line(screen, (180, 180, 255), (x, y), (x, y + length), 1)
-                # move drop
-                y = (y + int(10 + 18 * env.rain)) % self.h
-                x = (x + 1) % self.w
-                self._rain_drops[i] = (x, y, length)
+        self._update_overlay(env)
+        if self._overlay_key != ("day", 0):
+            screen.blit(self._overlay, (0, 0))
+
+        # Rain (simple streaks); light rain below the first step draws none
+        count = self._rain_streaks(env)
+        if count:
+            self._update_rain_texture(count)
+
+            # move drops: scroll the texture and wrap it around the screen
+            self._rain_y = (self._rain_y + int(10 + 18 * env.rain)) % self.h
+            self._rain_x = (self._rain_x + 1) % self.w
+            for dx in (self._rain_x, self._rain_x - self.w):
+                for dy in (self._rain_y, self._rain_y - self.h):
+                    screen.blit(self._rain_surface, (dx, dy))
@@ -0,0 +1,242 @@
+# Network.py
+# A grid of intersections (one Simulation each) that hand cars to their neighbours.
+# Partitions of the grid step in worker processes; cars crossing between intersections
+# are exchanged once per tick through the coordinator, so results do not depend on
+# how the grid is partitioned.
+import argparse
+import json
+import multiprocessing
+import os
+from collections import deque
+
+import Settings
+import SimClock
+import Simulation
+
+# Grid offset (row, col) of the next intersection for a car driving in each direction
+NEXT_INTERSECTION = {"N": (-1, 0), "S": (1, 0), "E": (0, 1), "W": (0, -1)}
+
+
+def outer_directions(row, col, rows, cols):
+    """Directions in which cars enter the network at this intersection (its outward sides)"""
+    directions = []
+    if row == rows - 1:
+        directions.append("N")  # northbound cars come in from the bottom edge
+    if row == 0:
+        directions.append("S")
+    if col == 0:
+        directions.append("E")
+    if col == cols - 1:
+        directions.append("W")
+    return directions
+
+
+class Partition:
+    """Some intersections of the grid, stepped together in one process."""
+    def __init__(self, indices, rows, cols, config, seed, dt, backend="objects"):
+        """
+        indices = row-major indexes of the intersections this partition owns
+        seed    = network seed; intersection i uses seed + i whatever the partitioning
+        """
+        self.rows = rows
+        self.cols = cols
+        self.dt = dt
+        self.handed_in = 0
+        self.exited = 0  # cars that drove off the edge of the network
+
+        window_width, window_height = Simulation.init_headless()
+        self.sims = {}
+        self.waiting = {}  # index -> cars handed over but not admitted yet (their lane is full)
+        for i in indices:
+            row, col = divmod(i, cols)
+            sim = Simulation.Simulation(window_width, window_height, config, verbose=False,
+                                        backend=backend, clock=SimClock.FixedStepClock(),
+                                        seed=seed + i,
+                                        spawn_directions=outer_directions(row, col, rows, cols))
+            sim.exits = []
+            self.sims[i] = sim
+            self.waiting[i] = deque()
+
+    def step(self, arrivals):
+        """
+        Admit the cars handed over last tick, step every intersection one tick and return the
+        cars leaving towards another intersection as [(index, direction, speed, model)].
+        """
+        for i, direction, speed, model in arrivals:
+            self.waiting[i].append((direction, speed, model))
+
+        departures = []
+        for i, sim in self.sims.items():
+            waiting = self.waiting[i]
+            for _ in range(len(waiting)):
+                car = waiting.popleft()
+                if sim.enter_car(*car):
+                    self.handed_in += 1
+                else:
+                    # spillback: the car stays at the boundary until its lane has room
+                    waiting.append(car)
+
+            sim.step(self.dt)
+
+            row, col = divmod(i, self.cols)
+            for car in sim.exits:
+                d_row, d_col = NEXT_INTERSECTION[car.direction]
+                r, c = row + d_row, col + d_col
+                if 0 <= r < self.rows and 0 <= c < self.cols:
+                    departures.append((r * self.cols + c, car.direction, car.base_speed, car.model_key))
+                else:
+                    self.exited += 1
+            sim.exits.clear()
+        return departures
+
+    def summary(self):
+        """Totals over this partition's intersections"""
+        waits = {}  # index -> (sum, count), added up by the coordinator in index order
+        for i, sim in self.sims.items():
+            sim.finish()
+            w = sim.finished_waits + [st["wait_total"] for st in sim.car_wait.values()]
+            waits[i] = (sum(w), len(w))
+        return {
+            # spawned at the network's edge, as opposed to handed over by a neighbour
+            "entered": sum(sim.cars_spawned for sim in self.sims.values()) - self.handed_in,
+            "intersection_crossings": sum(sim.cars_crossed for sim in self.sims.values()),
+            "peds_crossed": sum(sim.peds_crossed for sim in self.sims.values()),
+            "cars_on_road": sum(len(sim.cars) for sim in self.sims.values()),
+            "cars_waiting_at_boundaries": sum(len(q) for q in self.waiting.values()),
+            "exited": self.exited,
+            "waits": waits,
+        }
+
+
+def _partition_worker(conn, args):
+    """Worker process: owns one Partition and steps it on request"""
+    partition = Partition(*args)
+    while True:
+        message, payload = conn.recv()
+        if message == "step":
+            conn.send(partition.step(payload))
+        elif message == "summary":
+            conn.send(partition.summary())
+        else:  # "close"
+            conn.close()
+            return
+
+
+def split(count, parts):
+    """Contiguous, nearly equal runs of range(count)"""
+    size, extra = divmod(count, parts)
+    runs, start = [], 0
+    for p in range(parts):
+        end = start + size + (1 if p < extra else 0)
+        runs.append(list(range(start, end)))
+        start = end
+    return runs
+
+
+class Network:
+    """rows x cols intersections; workers > 1 steps the partitions in parallel processes."""
+    def __init__(self, rows, cols, config, seed=0, dt=1 / 60, workers=None, backend="objects"):
+        self.rows = rows
+        self.cols = cols
+        self.dt = dt
+        self.ticks = 0
+        count = rows * cols
+        workers = min(count, workers or os.cpu_count())
+        self.owner = {}  # intersection index -> partition number
+        partitions = split(count, workers)
+        for p, indices in enumerate(partitions):
+            for i in indices:
+                self.owner[i] = p
+
+        self.local = None
+        self.pipes = []
+        self.processes = []
+        if workers == 1:
+            self.local = Partition(partitions[0], rows, cols, config, seed, dt, backend)
+        else:
+            context = multiprocessing.get_context("spawn")
+            for indices in partitions:
+                parent, child = context.Pipe()
+                process = context.Process(target=_partition_worker, daemon=True,
+                                          args=(child, (indices, rows, cols, config, seed, dt, backend)))
+                process.start()
+                self.pipes.append(parent)
+                self.processes.append(process)
+        self._arrivals = [[] for _ in partitions]
+
+    def step(self):
+        """One tick of every intersection, then route the cars that crossed a boundary"""
+        arrivals, self._arrivals = self._arrivals, [[] for _ in self._arrivals]
+        if self.local:
+            departures = [self.local.step(arrivals[0])]
+        else:
+            for pipe, batch in zip(self.pipes, arrivals):
+                pipe.send(("step", batch))
+            departures = [pipe.recv() for pipe in self.pipes]
+
+        # handed over next tick, in partition order (same order for any partitioning)
+        for batch in departures:
+            for car in batch:
+                self._arrivals[self.owner[car[0]]].append(car)
+        self.ticks += 1
+
+    def summary(self):
+        if self.local:
+            parts = [self.local.summary()]
+        else:
+            for pipe in self.pipes:
+                pipe.send(("summary", None))
+            parts = [pipe.recv() for pipe in self.pipes]
+
+        waits = {}
+        for p in parts:
+            waits.update(p.pop("waits"))
+        total = {key: sum(p[key] for p in parts) for key in parts[0]}
+        wait_sum = sum(waits[i][0] for i in sorted(waits))
+        wait_count = sum(count for _, count in waits.values())
+        total["cars_in_transit"] = sum(len(batch) for batch in self._arrivals)
+        total["avg_car_wait"] = wait_sum / wait_count if wait_count else 0.0
+        total["sim_time"] = self.ticks * self.dt
+        total["intersections"] = self.rows * self.cols
+        return total
+
+    def close(self):
+        for pipe in self.pipes:
+            pipe.send(("close", None))
+        for process in self.processes:
+            process.join()
+        self.pipes, self.processes = [], []
+
+
+def run_network(rows, cols, config, duration, dt=1 / 60, seed=0, workers=None, backend="objects"):
+    """Run a rows x cols grid for duration simulated seconds and return its totals"""
+    network = Network(rows, cols, config, seed=seed, dt=dt, workers=workers, backend=backend)
+    try:
+        for _ in range(int(duration / dt)):
+            network.step()
+        return network.summary()
+    finally:
+        network.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Simulate a grid of intersections on all cores")
+    parser.add_argument("--rows", type=int, default=3)
+    parser.add_argument("--cols", type=int, default=3)
+    parser.add_argument("--duration", type=float, default=300, help="simulated seconds")
+    parser.add_argument("--dt", type=float, default=1 / 60, help="seconds per tick")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: all cores)")
+    parser.add_argument("--backend", choices=["objects", "vector"], default="objects")
+    for key, options in Settings.OPTIONS.items():
+        parser.add_argument(f"--{key}", choices=options, default=Settings.DEFAULT_SETTINGS[key])
+    args = parser.parse_args(argv)
+
+    settings = {key: getattr(args, key) for key in Settings.OPTIONS}
+    stats = run_network(args.rows, args.cols, Settings.build_config(settings), args.duration,
+                        dt=args.dt, seed=args.seed, workers=args.workers, backend=args.backend)
+    print(json.dumps(stats, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,14 +1,15 @@
-from os.path import join
-import os
-import random
 import pygame
-import time
+import Assets
 
 
-class Pedestrian(pygame.sprite.Sprite):
+class Pedestrian:
+    """Simulation state of one pedestrian; Sprites.draw_pedestrian draws it."""
+    __slots__ = ("original_speed", "speed", "direction", "animation_state", "animation_timer",
+                 "animation_speed", "rect", "prev_x", "prev_y")
+
     def __init__(self, x, y, speed, direction):
         """
-        Initialize a pedestrian sprite
+        Initialize a pedestrian
 
         Args:
             x: Screen width
@@ -16,86 +17,74 @@ class Pedestrian(pygame.sprite.Sprite):
             speed: Movement speed of the pedestrian
             direction: Direction of movement ('N', 'S', 'E', 'W')
         """
-        super().__init__()
+        self.reset(x, y, speed, direction)
+
+    def reset(self, x, y, speed, direction):
+        """Set the pedestrian up for a new crossing (pooled pedestrians are reused through here)"""
         self.original_speed = speed
         self.speed = speed
         self.direction = direction
         self.animation_state = 'idle'  # idle, left_foot, right_foot
         self.animation_timer = 0
-        self.animation_speed = 10  # frames between animation changes
-
-        # Load pedestrian images
-        pedestrian_folder_path = join("assets", "pedestrians")
-
-        self.images = {
-            'idle': pygame.image.load(join(pedestrian_folder_path, 'idle.png')).convert_alpha(),
-            'left_foot': pygame.image.load(join(pedestrian_folder_path, 'left_foot.png')).convert_alpha(),
-            'right_foot': pygame.image.load(join(pedestrian_folder_path, 'right_foot.png')).convert_alpha()
-        }
+        self.animation_speed = 10  # 60 Hz ticks between animation changes
 
-        # Scale all images
-        for state in self.images:
-            self.images[state] = pygame.transform.scale_by(self.images[state], 0.045)
-
-        # Set initial image and rotation based on direction
+        # Set initial position based on direction
         self._setup_direction(x, y)
+        # position before the last tick, drawn in between by an interpolating renderer
+        self.prev_x, self.prev_y = self.rect.topleft
 
     def _setup_direction(self, x, y):
-        """Setup pedestrian position and rotation based on direction"""
+        """Setup pedestrian position based on direction"""
         # Offset to position pedestrians on the crosswalk (right side of the road)
         crosswalk_offset = x * 0.11  # Adjust this value based on your road width
 
+        # Frames face north; east/west-bound pedestrians are turned a quarter
+        width, height = Assets.get_pedestrian_size()
+        if self.direction in ("E", "W"):
+            width, height = height, width
+        self.rect = pygame.FRect(0, 0, width, height)
+
         if self.direction == "S":
             # Moving down - position on right side of vertical road
-            for state in self.images:
-                self.images[state] = pygame.transform.rotate(self.images[state], 180)
-            self.image = self.images[self.animation_state]
-            self.rect = self.image.get_frect(center=(x / 2 + crosswalk_offset, 0))
+            self.rect.center = (x / 2 + crosswalk_offset, 0)
 
         elif self.direction == "N":
             # Moving up - position on right side of vertical road
-            for state in self.images:
-                self.images[state] = pygame.transform.rotate(self.images[state], 0)
-            self.image = self.images[self.animation_state]
-            self.rect = self.image.get_frect(center=(x / 2 - crosswalk_offset, y))
+            self.rect.center = (x / 2 - crosswalk_offset, y)
 
         elif self.direction == "E":
             # Moving right - position on right side of horizontal road
-            for state in self.images:
-                self.images[state] = pygame.transform.rotate(self.images[state], -90)
-            self.image = self.images[self.animation_state]
-            self.rect = self.image.get_frect(center=(0, y / 2 + crosswalk_offset))
+            self.rect.center = (0, y / 2 + crosswalk_offset)
 
         elif self.direction == "W":
             # Moving left - position on right side of horizontal road
-            for state in self.images:
-                self.images[state] = pygame.transform.rotate(self.images[state], 90)
-            self.image = self.images[self.animation_state]
-            self.rect = self.image.get_frect(center=(x, y / 2 - crosswalk_offset))
+            self.rect.center = (x, y / 2 - crosswalk_offset)
 
-    def update(self):
-        """Update pedestrian position and animation"""
+    def update(self, scale=1.0):
+        """Update pedestrian position and animation (scale: tick length in Simulation.SPEED_TICK units)"""
         # Update animation
-        self._update_animation()
+        self._update_animation(scale)
 
         # Update position based on direction
+        self.prev_x, self.prev_y = self.rect.topleft
+        distance = self.speed * scale
         if self.direction == "N":
-            self.rect.y -= self.speed
+            self.rect.y -= distance
         elif self.direction == "S":
-            self.rect.y += self.speed
+            self.rect.y += distance
         elif self.direction == "E":
-            self.rect.x += self.speed
+            self.rect.x += distance
         elif self.direction == "W":
-            self.rect.x -= self.speed
+            self.rect.x -= distance
 
-    def _update_animation(self):
+    def _update_animation(self, scale=1.0):
         """Handle animation state transitions"""
         if self.speed == 0:
             # Pedestrian is stopped, show idle animation
             self.animation_state = 'idle'
         else:
             # Pedestrian is moving, cycle through walking animations
-            self.animation_timer += 1
+            self.animation_timer += scale
 
             if self.animation_timer >= self.animation_speed:
                 self.animation_timer = 0
@@ -107,9 +96,6 @@ class Pedestrian(pygame.sprite.Sprite):
                 elif self.animation_state == 'right_foot':
                     self.animation_state = 'left_foot'
 
-        # Update the displayed image
-        self.image = self.images[self.animation_state]
-
     def stop(self):
         """Stop the pedestrian"""
         self.speed = 0
@@ -118,10 +104,6 @@ class Pedestrian(pygame.sprite.Sprite):
         """Resume pedestrian movement"""
         self.speed = self.original_speed
 
-    def draw(self, surface):
-        """Draw pedestrian on surface"""
-        surface.blit(self.image, self.rect)
-
     def check_stop_line(self, stop_line_rect):
         """Check if the pedestrian intersects with a stop line (crosswalk)"""
         if self.direction == "N":
@@ -0,0 +1,30 @@
+# Pool.py
+
+
+class EntityPool:
+    """Free list of retired Car/Pedestrian objects, reset and reused instead of rebuilt."""
+    def __init__(self, factory, max_free=256):
+        """
+        factory  = class to build from when the pool is empty; instances must have
+                   reset() taking the same arguments as the constructor
+        max_free = retired objects kept at most (the rest are left to the GC)
+        """
+        self.factory = factory
+        self.max_free = max_free
+        self._free = []
+        self.created = 0
+        self.reused = 0
+
+    def acquire(self, *args, **kwargs):
+        if self._free:
+            entity = self._free.pop()
+            entity.reset(*args, **kwargs)
+            self.reused += 1
+            return entity
+        self.created += 1
+        return self.factory(*args, **kwargs)
+
+    def release(self, entity):
+        """Hand back an entity nothing else references any more"""
+        if len(self._free) < self.max_free:
+            self._free.append(entity)
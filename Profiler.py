@@ -0,0 +1,100 @@
+# Profiler.py
+# Frame-phase timers: the loop calls begin() once per frame and lap(phase) after each phase.
+import collections
+import csv
+import time
+import pygame
+
+PERCENTILES = (50, 95, 99)
+
+
+class PhaseProfiler:
+    """Rolling per-phase timings (ms) over the last window frames."""
+    def __init__(self, window=600):
+        self.window = window
+        self.samples = {}  # phase -> deque of its last window durations, in first-seen phase order
+        self._last = time.perf_counter()
+
+    def begin(self):
+        """Start a frame: the next lap is measured from here"""
+        self._last = time.perf_counter()
+
+    def lap(self, phase):
+        """Record the time since the previous lap (or begin) under phase"""
+        now = time.perf_counter()
+        samples = self.samples.get(phase)
+        if samples is None:
+            samples = self.samples[phase] = collections.deque(maxlen=self.window)
+        samples.append((now - self._last) * 1000)
+        self._last = now
+
+    def summary(self):
+        """Return {phase: {'samples', 'mean', 'p50', 'p95', 'p99', 'max'}} in ms"""
+        result = {}
+        for phase, samples in self.samples.items():
+            ordered = sorted(samples)
+            n = len(ordered)
+            row = {"samples": n, "mean": sum(ordered) / n, "max": ordered[-1]}
+            for p in PERCENTILES:
+                # nearest-rank percentile
+                row[f"p{p}"] = ordered[max(0, -(-p * n // 100) - 1)]
+            result[phase] = row
+        return result
+
+    def write_csv(self, path):
+        """Dump the summary, one row per phase"""
+        columns = ["samples", "mean"] + [f"p{p}" for p in PERCENTILES] + ["max"]
+        with open(path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["phase"] + [c if c == "samples" else f"{c}_ms" for c in columns])
+            for phase, row in self.summary().items():
+                writer.writerow([phase] + [row["samples"]] + [f"{row[c]:.4f}" for c in columns[1:]])
+
+
+class ProfilerHUD:
+    """Overlay listing p50/p95/p99 per phase; drawn like a Button (update returns its rect)."""
+    def __init__(self, profiler, font, pos=(8, 8), refresh=30):
+        """
+        profiler = PhaseProfiler to display
+        font     = pygame font for the rows
+        pos      = top-left corner of the panel
+        refresh  = frames between two re-renders of the text (percentiles are not free)
+        """
+        self.profiler = profiler
+        self.font = font
+        self.pos = pos
+        self.refresh = refresh
+        self._frames = 0
+        self._panel = None
+
+    def _render(self):
+        rows = [("phase", "p50", "p95", "p99")]
+        total = 0.0
+        for phase, st in self.profiler.summary().items():
+            rows.append((phase, f"{st['p50']:.2f}", f"{st['p95']:.2f}", f"{st['p99']:.2f}"))
+            total += st["mean"]
+        rows.append(("frame (mean)", f"{total:.2f}", "", ""))
+
+        # one surface per cell, laid out in columns (the font is not monospaced)
+        cells = [[self.font.render(text, True, "White") for text in row] for row in rows]
+        widths = [max(row[i].get_width() for row in cells) + 10 for i in range(4)]
+        line_height = self.font.get_linesize()
+        panel = pygame.Surface((sum(widths) + 10, line_height * len(rows) + 10), pygame.SRCALPHA)
+        panel.fill((0, 0, 0, 170))
+        for r, row in enumerate(cells):
+            x = 6
+            for i, cell in enumerate(row):
+                # phase names left-aligned, numbers right-aligned
+                offset = 0 if i == 0 else widths[i] - 10 - cell.get_width()
+                panel.blit(cell, (x + offset, 5 + r * line_height))
+                x += widths[i]
+        self._panel = panel
+
+    def update(self, screen):
+        if self._panel is None or self._frames % self.refresh == 0:
+            if self.profiler.samples:
+                self._render()
+        self._frames += 1
+        if self._panel is None:
+            return pygame.Rect(self.pos, (0, 0))
+        return screen.blit(self._panel, self.pos)
@@ -0,0 +1,155 @@
+# Recording.py
+# Compact binary log of a run: tick lengths, spawns, light phase changes and weather targets.
+# Replaying it rebuilds exactly the same traffic without drawing a single random number.
+import json
+import struct
+import sys
+import zlib
+
+MAGIC = b"TRSR"
+VERSION = 2  # 2: entities move by dt (Simulation.SPEED_TICK), not by tick
+
+DIRECTIONS = ("N", "S", "E", "W")
+PHASES = ("NS", "NS_YELLOW", "EW", "EW_YELLOW", "NS_ALL_RED", "EW_ALL_RED")
+TIMES_OF_DAY = ("day", "dusk", "night")
+
+# Event kinds; each record is (kind, tick) followed by the kind's payload
+DT, CAR, PEDESTRIAN, PHASE, WEATHER = range(5)
+_HEAD = struct.Struct("<BI")
+_PAYLOADS = {
+    DT: struct.Struct("<d"),            # seconds per tick, from this tick on
+    CAR: struct.Struct("<BdBB"),        # direction, speed, category index, model index
+    PEDESTRIAN: struct.Struct("<Bd"),   # direction, speed
+    PHASE: struct.Struct("<B"),         # new controller phase
+    WEATHER: struct.Struct("<ddB"),     # rain, fog, time of day targets
+}
+
+
+class Recorder:
+    """Collects the events of one run in memory; save() writes them zlib-compressed."""
+    def __init__(self, seed, config, size, backend="objects"):
+        """
+        seed    = seed of the run's random stream (kept for reference, replays do not need it)
+        config  = CONFIG dict the run used
+        size    = (window_width, window_height) of the simulated intersection
+        backend = "objects" or "vector"
+        """
+        self.header = {"seed": seed, "config": dict(config), "size": list(size), "backend": backend}
+        self.ticks = 0
+        self._events = bytearray()
+        self._dt = None
+
+    def _write(self, kind, tick, *values):
+        self._events += _HEAD.pack(kind, tick)
+        self._events += _PAYLOADS[kind].pack(*values)
+
+    def tick(self, tick, dt):
+        # only changes of dt are stored (fixed-step runs write a single record)
+        self.ticks = tick
+        if dt != self._dt:
+            self._dt = dt
+            self._write(DT, tick, dt)
+
+    def car(self, tick, car):
+        self._write(CAR, tick, DIRECTIONS.index(car.direction), car.base_speed, *car.model_key)
+
+    def pedestrian(self, tick, pedestrian):
+        self._write(PEDESTRIAN, tick, DIRECTIONS.index(pedestrian.direction), pedestrian.original_speed)
+
+    def phase(self, tick, phase):
+        self._write(PHASE, tick, PHASES.index(phase))
+
+    def weather(self, tick, rain, fog, time_of_day):
+        self._write(WEATHER, tick, rain, fog, TIMES_OF_DAY.index(time_of_day))
+
+    def save(self, path, stats=None):
+        """Write the log; stats (get_stats() of the run) let a replay check itself"""
+        header = json.dumps(dict(self.header, ticks=self.ticks, stats=stats)).encode()
+        with open(path, "wb") as f:
+            f.write(MAGIC)
+            f.write(struct.pack("<BI", VERSION, len(header)))
+            f.write(header)
+            f.write(zlib.compress(bytes(self._events), 9))
+
+
+class Replay:
+    """A loaded recording: header fields, events grouped by tick and the recorded phase changes."""
+    def __init__(self, header, events):
+        self.seed = header["seed"]
+        self.config = header["config"]
+        self.size = tuple(header["size"])
+        self.backend = header["backend"]
+        self.ticks = header["ticks"]
+        self.stats = header.get("stats")
+
+        self._dts = []           # (first tick, dt)
+        self._events = {}        # tick -> [(kind, values)] for spawns and weather
+        self.phases = []         # (tick, phase) as recorded
+        self.replayed_phases = []  # (tick, phase) as seen while replaying
+
+        offset = 0
+        while offset < len(events):
+            kind, tick = _HEAD.unpack_from(events, offset)
+            offset += _HEAD.size
+            payload = _PAYLOADS[kind]
+            values = payload.unpack_from(events, offset)
+            offset += payload.size
+
+            if kind == DT:
+                self._dts.append((tick, values[0]))
+            elif kind == PHASE:
+                self.phases.append((tick, PHASES[values[0]]))
+            else:
+                self._events.setdefault(tick, []).append((kind, values))
+
+    def dts(self):
+        """Yield the dt of every recorded tick, in order"""
+        changes = self._dts + [(self.ticks + 1, None)]
+        for (start, dt), (end, _) in zip(changes, changes[1:]):
+            for _ in range(start, end):
+                yield dt
+
+    def events_at(self, tick):
+        return self._events.get(tick, ())
+
+    def check_phase(self, tick, phase):
+        self.replayed_phases.append((tick, phase))
+
+    def first_divergence(self):
+        """Tick of the first phase change that differs from the recording, or None"""
+        for recorded, replayed in zip(self.phases, self.replayed_phases):
+            if recorded != replayed:
+                return min(recorded[0], replayed[0])
+        if len(self.phases) != len(self.replayed_phases):
+            shorter = min(self.phases, self.replayed_phases, key=len)
+            longer = max(self.phases, self.replayed_phases, key=len)
+            return longer[len(shorter)][0]
+        return None
+
+
+def load(path):
+    """Read a recording written by Recorder.save"""
+    with open(path, "rb") as f:
+        data = f.read()
+    if data[:4] != MAGIC:
+        raise ValueError(f"{path} is not a simulation recording")
+    version, header_size = struct.unpack_from("<BI", data, 4)
+    if version != VERSION:
+        raise ValueError(f"{path}: unsupported recording version {version}")
+    start = 4 + struct.calcsize("<BI")
+    header = json.loads(data[start:start + header_size])
+    events = zlib.decompress(data[start + header_size:])
+    return Replay(header, events)
+
+
+if __name__ == "__main__":
+    # python Recording.py run.trr : replay headless at full speed and check it against the log
+    import Simulation
+
+    replay = load(sys.argv[1])
+    stats = Simulation.replay_headless(replay)
+    print(f"Replayed {replay.ticks} ticks: {stats}")
+    if replay.stats is not None:
+        print("Stats match the recording" if stats == replay.stats else f"Recorded stats: {replay.stats}")
+    divergence = replay.first_divergence()
+    print("Light phases match the recording" if divergence is None else f"Light phases diverge at tick {divergence}")
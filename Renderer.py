@@ -0,0 +1,119 @@
+# Renderer.py
+import pygame
+import Sprites
+
+
+def _place_between(entities, alpha):
+    """Move each rect alpha of the way from its position before the last tick; returns the real positions"""
+    positions = []
+    for entity in entities:
+        rect = entity.rect
+        x, y = rect.topleft
+        positions.append((x, y))
+        rect.topleft = (entity.prev_x + (x - entity.prev_x) * alpha, entity.prev_y + (y - entity.prev_y) * alpha)
+    return positions
+
+
+def _restore(entities, positions):
+    for entity, position in zip(entities, positions):
+        entity.rect.topleft = position
+
+
+class SceneRenderer:
+    """
+    Draws the simulation over a cached static layer (background + stop lines + lights).
+    Only the regions that changed are pushed to the display, unless the weather
+    paints over the whole screen.
+    """
+    def __init__(self, display, background, sim_data):
+        self.display = display
+        self.sim_data = sim_data
+        self.background = background.convert()
+        self.static_layer = pygame.Surface(display.get_size()).convert()
+        self._static_key = None
+        self._last_rects = []      # regions drawn last frame, restored from the static layer
+        self._was_covered = False  # last frame had a full-screen weather overlay
+        self.profiler = None       # optional Profiler.PhaseProfiler, lapped after each draw phase
+
+    def _update_static_layer(self):
+        """Rebuild the static layer when a light changed color; returns True if it was rebuilt"""
+        lights = self.sim_data['traffic_lights']
+        key = tuple(light.get_color() for light in lights.values())
+        if key == self._static_key:
+            return False
+        self._static_key = key
+
+        layer = self.static_layer
+        sim_data = self.sim_data
+        layer.blit(self.background, (0, 0))
+        layer.blit(sim_data['line_image'], sim_data['line_north'])
+        layer.blit(sim_data['line_image'], sim_data['line_south'])
+        layer.blit(sim_data['line_image_vertical'], sim_data['line_east'])
+        layer.blit(sim_data['line_image_vertical'], sim_data['line_west'])
+        for light in lights.values():
+            light.draw(layer)
+        return True
+
+    def draw(self, cars, pedestrians, env, weather_fx, widgets=(), alpha=1.0):
+        """
+        Draw one frame and update the display. alpha < 1 draws every car and pedestrian that
+        far between its position before the last tick (0) and its current one (1).
+        """
+        display = self.display
+        prof = self.profiler
+        covered = weather_fx.covers_screen(env)
+        rebuilt = self._update_static_layer()
+        full = covered or rebuilt or self._was_covered
+        self._was_covered = covered
+
+        # Erase last frame's sprites (or everything) with the static layer
+        if full:
+            display.blit(self.static_layer, (0, 0))
+        else:
+            for rect in self._last_rects:
+                display.blit(self.static_layer, rect, rect)
+
+        if prof:
+            prof.lap("draw_static")
+
+        interpolate = alpha < 1.0
+        if interpolate:
+            car_positions = _place_between(cars, alpha)
+            pedestrian_positions = _place_between(pedestrians, alpha)
+
+        rects = []
+        # Draw all cars (headlights and emergency lights included)
+        for car in cars:
+            rects.append(Sprites.draw_car(display, car, env))
+        if prof:
+            prof.lap("draw_cars")
+
+        # Draw all pedestrians
+        for pedestrian in pedestrians:
+            rects.append(Sprites.draw_pedestrian(display, pedestrian))
+        if prof:
+            prof.lap("draw_pedestrians")
+
+        if interpolate:
+            _restore(cars, car_positions)
+            _restore(pedestrians, pedestrian_positions)
+
+        # Lights stay on top of the sprites passing under them
+        for light in self.sim_data['traffic_lights'].values():
+            rects.append(light.draw(display))
+
+        for widget in widgets:
+            rects.append(widget.update(display))
+
+        if covered:
+            weather_fx.draw(display, env)
+        if prof:
+            prof.lap("draw_weather")
+
+        if full:
+            pygame.display.update()
+        else:
+            pygame.display.update(self._last_rects + rects)
+        self._last_rects = rects
+        if prof:
+            prof.lap("present")
@@ -0,0 +1,53 @@
+# Scheduler.py
+# Deadlines of the engine's timed events (spawns, light phases, weather changes) in a min-heap,
+# so a tick only wakes the components whose time has come and the next event is known up front.
+import heapq
+import math
+
+# Deadlines are registered this much early: the component's own elapsed-time test stays the
+# authority, so float rounding can at worst make it poll one extra tick, never fire one late
+SLACK = 1e-9
+
+
+class EventScheduler:
+    """Min-heap of (deadline, event); each event has at most one live deadline."""
+    def __init__(self):
+        self._heap = []
+        self._deadlines = {}  # event -> its live deadline (heap entries not matching it are stale)
+
+    def schedule(self, event, deadline):
+        """Set (or move) the deadline of event, in clock seconds; math.inf unschedules it"""
+        if deadline == math.inf:
+            self._deadlines.pop(event, None)
+        else:
+            deadline -= SLACK
+            if self._deadlines.get(event) == deadline:
+                return
+            self._deadlines[event] = deadline
+            heapq.heappush(self._heap, (deadline, event))
+        # moved deadlines leave stale entries behind; rebuild once they outnumber the live ones
+        if len(self._heap) > 2 * len(self._deadlines):
+            self._heap = [(deadline, event) for event, deadline in self._deadlines.items()]
+            heapq.heapify(self._heap)
+
+    def _prune(self):
+        heap = self._heap
+        while heap and self._deadlines.get(heap[0][1]) != heap[0][0]:
+            heapq.heappop(heap)
+
+    def next_deadline(self):
+        """Earliest pending deadline (math.inf when nothing is scheduled)"""
+        self._prune()
+        return self._heap[0][0] if self._heap else math.inf
+
+    def pop_due(self, now):
+        """Remove and return the set of events whose deadline is at or before now"""
+        due = set()
+        heap = self._heap
+        while True:
+            self._prune()
+            if not heap or heap[0][0] > now:
+                return due
+            _, event = heapq.heappop(heap)
+            del self._deadlines[event]
+            due.add(event)
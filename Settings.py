@@ -0,0 +1,100 @@
+# Settings.py
+# User-facing settings (menu choices) and the simulation CONFIG they map to.
+
+# Generated files (last run's recording and profile, batch and benchmark results) go here
+OUTPUT_DIR = "output"
+
+OPTIONS = {
+    "traffic": ["Low", "Normal", "High", "Rush Hour"],
+    "driving": ["Cautious", "Normal", "Aggressive"],
+    "pedestrians": ["Rare", "Normal", "Busy"],
+    "weather": ["Stable", "Changing", "Chaotic"],
+    "signals": ["Fixed", "Adaptive"],
+}
+
+DEFAULT_SETTINGS = {
+    "traffic": "Normal",         # Low / Normal / High / Rush Hour
+    "driving": "Normal",         # Cautious / Normal / Aggressive
+    "pedestrians": "Normal",     # Rare / Normal / Busy
+    "weather": "Changing",       # Stable / Changing / Chaotic
+    "signals": "Fixed",          # Fixed / Adaptive
+}
+
+DEFAULT_CONFIG = {
+    # Car spawn
+    "car_spawn_min": 1.0,
+    "car_spawn_max": 3.0,
+
+    # Ped spawn
+    "ped_spawn_min": 3.0,
+    "ped_spawn_max": 6.0,
+
+    # Car speed
+    "car_speed_min": 1.0,
+    "car_speed_max": 3.0,
+
+    # Ped speed
+    "ped_speed_min": 0.5,
+    "ped_speed_max": 1.5,
+
+    # Spawn spacing
+    "spawn_min_distance": 100,
+
+    # Weather
+    "weather_change_interval": 25,   # seconds
+
+    # Traffic lights: "fixed" 5 s greens or "adaptive" (queue-aware)
+    "signal_mode": "fixed",
+}
+
+
+def build_config(settings, config=None):
+    """Map menu settings onto a CONFIG dict (updated in place if given, else a new copy of the defaults)"""
+    config = dict(DEFAULT_CONFIG) if config is None else config
+    t = settings["traffic"]
+    d = settings["driving"]
+    p = settings["pedestrians"]
+    w = settings["weather"]
+    s = settings.get("signals", "Fixed")
+
+    # --- Traffic density ---
+    if t == "Low":
+        config["car_spawn_min"], config["car_spawn_max"] = 2.5, 4.5
+        config["spawn_min_distance"] = 140
+    elif t == "Normal":
+        config["car_spawn_min"], config["car_spawn_max"] = 1.0, 3.0
+        config["spawn_min_distance"] = 100
+    elif t == "High":
+        config["car_spawn_min"], config["car_spawn_max"] = 0.6, 1.5
+        config["spawn_min_distance"] = 85
+    else:  # Rush Hour
+        config["car_spawn_min"], config["car_spawn_max"] = 0.35, 0.9
+        config["spawn_min_distance"] = 75
+
+    # --- Driving style ---
+    if d == "Cautious":
+        config["car_speed_min"], config["car_speed_max"] = 0.8, 2.0
+    elif d == "Normal":
+        config["car_speed_min"], config["car_speed_max"] = 1.0, 3.0
+    else:  # Aggressive
+        config["car_speed_min"], config["car_speed_max"] = 1.8, 4.0
+
+    # --- Pedestrian activity ---
+    if p == "Rare":
+        config["ped_spawn_min"], config["ped_spawn_max"] = 7.0, 12.0
+    elif p == "Normal":
+        config["ped_spawn_min"], config["ped_spawn_max"] = 3.0, 6.0
+    else:  # Busy
+        config["ped_spawn_min"], config["ped_spawn_max"] = 1.5, 3.5
+
+    # --- Weather variability ---
+    if w == "Stable":
+        config["weather_change_interval"] = 60
+    elif w == "Changing":
+        config["weather_change_interval"] = 25
+    else:  # Chaotic
+        config["weather_change_interval"] = 10
+
+    # --- Traffic lights ---
+    config["signal_mode"] = "adaptive" if s == "Adaptive" else "fixed"
+    return config
@@ -0,0 +1,38 @@
+# SimClock.py
+import time
+
+
+class RealTimeClock:
+    """Wall-clock time. advance() is ignored: time moves on its own."""
+    def now(self):
+        return time.time()
+
+    def advance(self, dt, ticks=1):
+        pass
+
+
+class FixedStepClock:
+    """
+    Simulated time that only moves when the simulation advances it, so runs are reproducible.
+    Time is counted in ticks of the current dt, so n ticks advanced at once read exactly the
+    same as n ticks advanced one by one.
+    """
+    def __init__(self, start=0.0):
+        """start = value of now() before the first tick"""
+        self._now = start
+        self._base = start  # time at which dt last changed
+        self._dt = None
+        self._ticks = 0     # ticks of _dt since _base
+
+    def now(self):
+        return self._now
+
+    def advance(self, dt, ticks=1):
+        if dt != self._dt:
+            self._base, self._dt, self._ticks = self._now, dt, 0
+        self._ticks += ticks
+        self._now = self._base + self._ticks * dt
+
+
+# Shared default for components created without an explicit clock
+WALL_CLOCK = RealTimeClock()
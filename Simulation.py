@@ -0,0 +1,736 @@
+from os.path import join
+import math
+import random
+import pygame
+import Assets
+import Audio
+import Car
+import Pedestrian
+import Pool
+import Recording
+import Telemetry
+import SimClock
+import TrafficLight
+import TrafficLightController
+from Scheduler import EventScheduler
+from SpatialIndex import SpatialGrid, LaneIndex
+from VectorBackend import VectorKinematics
+from WeatherSystem import WeatherSystem
+
+
+# Speeds (config, Car.speed, Pedestrian.speed) are pixels per SPEED_TICK seconds; a tick of dt
+# moves everything dt / SPEED_TICK times that far, so results do not depend on the tick rate
+SPEED_TICK = 1 / 60
+
+# Timed events of Simulation.scheduler
+CAR_SPAWN = "car_spawn"
+PEDESTRIAN_SPAWN = "pedestrian_spawn"
+PHASE_CHANGE = "phase_change"
+WEATHER_CHANGE = "weather_change"
+
+
+def spawn_random_car(window_width, window_height, config, clock=None, rng=random,
+                     directions=('N', 'S', 'E', 'W'), pool=None):
+    direction = rng.choice(directions)
+    speed = rng.uniform(config["car_speed_min"], config["car_speed_max"])
+    make = pool.acquire if pool else Car.Car
+    return make(window_width, window_height, speed, direction, clock=clock, rng=rng)
+def spawn_test_pedestrian(window_width, window_height, config, rng=random, pool=None):
+    direction = rng.choice(['N', 'S', 'E', 'W'])
+    speed = rng.uniform(config["ped_speed_min"], config["ped_speed_max"])
+    make = pool.acquire if pool else Pedestrian.Pedestrian
+    return make(window_width, window_height, speed, direction)
+def is_spawn_position_clear(new_car, existing_cars, min_distance=100):
+    """Check if spawn position has enough space"""
+    for car in existing_cars:
+        if car.direction != new_car.direction:
+            continue
+
+        if new_car.direction in ["N", "S"]:
+            distance = abs(car.rect.centery - new_car.rect.centery)
+        else:
+            distance = abs(car.rect.centerx - new_car.rect.centerx)
+
+        if distance < min_distance:
+            return False
+
+    return True
+def is_entity_off_screen(entity, window_width, window_height):
+    """Check if an entity (car or pedestrian) has left the screen"""
+    return (entity.rect.right < 0 or entity.rect.left > window_width or
+            entity.rect.bottom < 0 or entity.rect.top > window_height)
+def initialize_simulation(window_width, window_height, clock=None, signal_mode="fixed", demand=None):
+    """Initialize all simulation components (demand: ApproachDemand for the adaptive signal mode)"""
+    # Traffic lights
+    traffic_light_south = TrafficLight.TrafficLight(window_width, window_height, 'S')
+    traffic_light_north = TrafficLight.TrafficLight(window_width, window_height, 'N')
+    traffic_light_east = TrafficLight.TrafficLight(window_width, window_height, 'E')
+    traffic_light_west = TrafficLight.TrafficLight(window_width, window_height, 'W')
+
+    # Load line image
+    line_image = Assets.surface(join('assets', 'line.png'))
+
+    line_north = line_image.get_frect(center=(window_width / 2, window_height / 2 + 100))
+    line_south = line_image.get_frect(center=(window_width / 2, window_height / 2 - 100))
+
+    line_image_vertical = pygame.transform.rotate(line_image, 90)
+    line_east = line_image_vertical.get_frect(center=(window_width / 2 - 90, window_height / 2))
+    line_west = line_image_vertical.get_frect(center=(window_width / 2 + 90, window_height / 2))
+
+    stop_lines = {
+        "N": line_north,
+        "S": line_south,
+        "E": line_east,
+        "W": line_west
+    }
+
+    traffic_lights = {
+        "N": traffic_light_north,
+        "S": traffic_light_south,
+        "E": traffic_light_east,
+        "W": traffic_light_west
+    }
+
+    controller = TrafficLightController.TrafficLightController(
+        traffic_light_north,
+        traffic_light_south,
+        traffic_light_east,
+        traffic_light_west,
+        clock=clock,
+        mode=signal_mode,
+        demand=demand
+    )
+
+    return {
+        'traffic_lights': traffic_lights,
+        'stop_lines': stop_lines,
+        'controller': controller,
+        'line_image': line_image,
+        'line_image_vertical': line_image_vertical,
+        'line_north': line_north,
+        'line_south': line_south,
+        'line_east': line_east,
+        'line_west': line_west,
+        'traffic_light_north': traffic_light_north,
+        'traffic_light_south': traffic_light_south,
+        'traffic_light_east': traffic_light_east,
+        'traffic_light_west': traffic_light_west
+    }
+
+
+class Simulation:
+    """Traffic engine: spawning, lights, weather, collision checks and stats. Does no drawing."""
+    def __init__(self, window_width, window_height, config, verbose=True, backend="objects", clock=None,
+                 profiler=None, seed=None, recorder=None, replay=None, telemetry=None,
+                 spawn_directions=("N", "S", "E", "W"), audio=None):
+        """
+        window_width  = width of the simulated intersection in pixels
+        window_height = height of the simulated intersection in pixels
+        config        = spawn/speed/weather settings (same keys as main.CONFIG)
+        verbose       = print spawn messages (turn off for headless runs)
+        backend       = "objects" (one Car/Pedestrian at a time) or "vector" (NumPy arrays)
+        clock         = time source shared by every component; defaults to a FixedStepClock
+                        advanced by step(dt), so the engine never reads the wall clock
+        profiler      = optional Profiler.PhaseProfiler; step() records a lap after each phase
+        seed          = seed of the run's random stream (spawns, car models, weather);
+                        a fresh one is drawn when None, kept in self.seed
+        recorder      = optional Recording.Recorder fed with every tick's events
+        replay        = optional Recording.Replay: spawns and weather come from the log instead
+                        of the random stream (step() must then be fed replay.dts())
+        telemetry     = optional Telemetry.TelemetryWriter fed every car's state every tick
+                        (the caller closes it)
+        spawn_directions = directions random cars may spawn in; an intersection inside a
+                        network only spawns on the sides facing outwards
+        audio         = Audio.AudioManager the horns and sirens are reported to; defaults to
+                        Audio.NULL_AUDIO, so headless runs never touch the mixer
+        """
+        self.clock = clock if clock is not None else SimClock.FixedStepClock()
+        self.start_time = self.clock.now()
+        self.window_width = window_width
+        self.window_height = window_height
+        self.config = config
+        self.verbose = verbose
+        self.profiler = profiler  # None: no timing at all
+        self.audio = audio if audio is not None else Audio.NULL_AUDIO
+
+        # Per-run random stream: every draw that shapes the traffic comes from here
+        self.seed = seed if seed is not None else random.randrange(2 ** 32)
+        self.rng = random.Random(self.seed)
+        self.recorder = recorder
+        self.replay = replay
+        self.telemetry = telemetry
+        self.spawn_directions = tuple(spawn_directions)
+        # list collecting cars that left the screen, when set (networks); read it before the
+        # next step, the cars in it are back in the pool and may be respawned
+        self.exits = None
+
+        self.weather_system = WeatherSystem(change_interval=config["weather_change_interval"],
+                                            clock=self.clock, rng=self.rng)
+        if replay:
+            # targets only change when the log says so
+            self.weather_system.change_interval = math.inf
+        self._weather_changes = 0
+        self.env = self.weather_system.env
+
+        # Queue lengths and arrival rates per approach, kept by add_car/_mark_stopped/_mark_moving
+        self.demand = TrafficLightController.ApproachDemand(self.clock)
+
+        # Initialize simulation components
+        self.sim_data = initialize_simulation(window_width, window_height, clock=self.clock,
+                                              signal_mode=config.get("signal_mode", "fixed"),
+                                              demand=self.demand)
+        self.stop_lines = self.sim_data['stop_lines']
+        self.traffic_lights = self.sim_data['traffic_lights']
+        self.controller = self.sim_data['controller']
+        self._phase = self.controller.current_phase
+
+        # Game state (seconds since start, read from the clock)
+        self.time = 0.0
+        self.ticks = 0
+        self.cars = []
+        self.pedestrians = []
+
+        # Spatial indexes so each entity only checks its neighbours
+        self.lanes = LaneIndex()
+        self.car_grid = SpatialGrid()
+        self.ped_grid = SpatialGrid()
+
+        # Retired cars/pedestrians are reset and respawned instead of rebuilt
+        self.car_pool = Pool.EntityPool(Car.Car)
+        self.ped_pool = Pool.EntityPool(Pedestrian.Pedestrian)
+
+        # Optional NumPy backend: cars/pedestrians live in arrays, sprites are synced for drawing
+        self.kinematics = None
+        if backend == "vector":
+            self.kinematics = VectorKinematics(self.stop_lines, window_width, window_height)
+            self.cars = self.kinematics.cars
+            self.pedestrians = self.kinematics.pedestrians
+
+        self.last_spawn_time = 0.0
+        self.spawn_interval = self.rng.uniform(config["car_spawn_min"], config["car_spawn_max"])
+        self.last_pedestrian_spawn_time = 0.0
+        self.pedestrian_spawn_interval = self.rng.uniform(config["ped_spawn_min"], config["ped_spawn_max"])
+
+        # Next spawn, light phase change and weather change; step() only wakes what is due
+        self.scheduler = EventScheduler()
+        if not replay:
+            self._schedule_spawns()
+        self.scheduler.schedule(PHASE_CHANGE, self.controller.next_change())
+        self.scheduler.schedule(WEATHER_CHANGE, self.weather_system.next_change())
+
+        self.cars_spawned = 0  # also the next Car.vehicle_id
+        self.cars_crossed = 0
+        self.peds_crossed = 0
+
+        # per-car wait tracking without editing Car.py
+        self.car_wait = {}  # key: id(car) -> {'wait_total':0, 'stopped':False, 'stop_started':0, 'queued':True}
+        # wait totals of cars that already left (their ids may be reused by new cars)
+        self.finished_waits = []
+
+        # Spawn initial test pedestrian
+        if replay:
+            self._spawn_replayed(replay.events_at(0))
+        else:
+            test_pedestrian = spawn_test_pedestrian(window_width, window_height, config, rng=self.rng,
+                                                    pool=self.ped_pool)
+            self.add_pedestrian(test_pedestrian)
+            if recorder:
+                recorder.pedestrian(0, test_pedestrian)
+            self._log(f"Spawned test pedestrian! Direction: {test_pedestrian.direction}")
+
+    def _log(self, message):
+        if self.verbose:
+            print(message)
+
+    def _before_stop_line(self, car):
+        """True while the car's center has not passed its stop line (queued, not in the box)"""
+        line = self.stop_lines[car.direction]
+        rect = car.rect
+        if car.direction == "N":
+            return rect.centery > line.centery
+        if car.direction == "S":
+            return rect.centery < line.centery
+        if car.direction == "E":
+            return rect.centerx < line.centerx
+        return rect.centerx > line.centerx
+
+    def _mark_stopped(self, car, queued=None):
+        """queued: car stopped before its stop line (worked out from its rect if None)"""
+        st = self.car_wait.get(id(car))
+        if st and not st["stopped"]:
+            st["stopped"] = True
+            st["stop_started"] = self.time
+            st["queued"] = self._before_stop_line(car) if queued is None else queued
+            self.demand.stopped(car.direction, st["queued"])
+            if self.controller.mode == "adaptive":
+                # a car queuing across can end a green resting on an empty road
+                self.scheduler.schedule(PHASE_CHANGE, self.controller.next_change())
+
+    def _mark_moving(self, car):
+        st = self.car_wait.get(id(car))
+        if st and st["stopped"]:
+            st["wait_total"] += self.time - st["stop_started"]
+            st["stopped"] = False
+            self.demand.resumed(car.direction, st["queued"])
+
+    def add_car(self, car):
+        """Put a car on the road (spawner, benchmarks and replays all go through here)"""
+        car.vehicle_id = self.cars_spawned
+        self.cars_spawned += 1
+        if self.kinematics:
+            self.kinematics.add_car(car)
+        else:
+            self.cars.append(car)
+            self.car_grid.insert(car)
+        self.lanes.add(car)
+        self.demand.arrived(car.direction)
+        if car.is_emergency:
+            self.audio.siren_on(car)
+        self.car_wait[id(car)] = {"wait_total": 0.0, "stopped": False, "stop_started": 0.0,
+                                "queued": True}
+
+    def add_pedestrian(self, pedestrian):
+        """Put a pedestrian on the road"""
+        if self.kinematics:
+            self.kinematics.add_pedestrian(pedestrian)
+        else:
+            self.pedestrians.append(pedestrian)
+            self.ped_grid.insert(pedestrian)
+
+    def _retire_car(self, car):
+        """Bookkeeping for a car that left the screen"""
+        self.cars_crossed += 1
+        self._mark_moving(car)
+        self.finished_waits.append(self.car_wait.pop(id(car))["wait_total"])
+
+        self.lanes.remove(car)
+        if self.exits is not None:
+            self.exits.append(car)
+        self._discard_car(car)
+
+    def _discard_car(self, car):
+        """Silence a car that is off the road and hand it back to the pool"""
+        if car.is_emergency:
+            self.audio.siren_off(car)
+        self.car_pool.release(car)
+
+    def _horn(self, car):
+        """A car braking for a crash honks (at most every 3 s)"""
+        if car.horn(3):
+            self.audio.horn(car)
+
+    def _schedule_spawns(self, events=(CAR_SPAWN, PEDESTRIAN_SPAWN)):
+        start = self.start_time
+        if CAR_SPAWN in events and self.spawn_directions:
+            self.scheduler.schedule(CAR_SPAWN, start + self.last_spawn_time + self.spawn_interval)
+        if PEDESTRIAN_SPAWN in events:
+            self.scheduler.schedule(PEDESTRIAN_SPAWN,
+                                    start + self.last_pedestrian_spawn_time + self.pedestrian_spawn_interval)
+
+    def _spawn(self, due):
+        """Spawn cars and pedestrians whose timers have run out (due: events woken this tick)"""
+        config = self.config
+
+        # Spawn new cars randomly
+        if CAR_SPAWN in due and self.time - self.last_spawn_time >= self.spawn_interval:
+            new_car = spawn_random_car(self.window_width, self.window_height, config,
+                                       clock=self.clock, rng=self.rng, directions=self.spawn_directions,
+                                       pool=self.car_pool)
+
+            if self._add_if_clear(new_car):
+                if self.recorder:
+                    self.recorder.car(self.ticks, new_car)
+                self._log(f"Spawned car! Total cars: {len(self.cars)}")
+            else:
+                self._discard_car(new_car)
+                self._log("Spawn blocked - car already at spawn position")
+
+            self.last_spawn_time = self.time
+            self.spawn_interval = self.rng.uniform(config["car_spawn_min"], config["car_spawn_max"])
+
+        # Spawn new pedestrians randomly
+        if PEDESTRIAN_SPAWN in due and self.time - self.last_pedestrian_spawn_time >= self.pedestrian_spawn_interval:
+            new_pedestrian = spawn_test_pedestrian(self.window_width, self.window_height, config,
+                                                   rng=self.rng, pool=self.ped_pool)
+            self.add_pedestrian(new_pedestrian)
+            if self.recorder:
+                self.recorder.pedestrian(self.ticks, new_pedestrian)
+            self._log(f"Spawned pedestrian! Total pedestrians: {len(self.pedestrians)}")
+
+            self.last_pedestrian_spawn_time = self.time
+            self.pedestrian_spawn_interval = self.rng.uniform(config["ped_spawn_min"], config["ped_spawn_max"])
+
+        # next deadlines (the same again if a timer had not quite run out)
+        self._schedule_spawns(due)
+
+    def _add_if_clear(self, new_car):
+        """Add a car at its spawn point unless the lane is backed up to it; returns True if added"""
+        # cars never overtake, so the last car of the lane is the closest one to the spawn point
+        last_car = self.lanes.last(new_car.direction)
+        if last_car and self.kinematics:
+            self.kinematics.sync_car(last_car)
+        nearby = [last_car] if last_car else []
+        if not is_spawn_position_clear(new_car, nearby, min_distance=self.config["spawn_min_distance"]):
+            return False
+        self.add_car(new_car)
+        return True
+
+    def enter_car(self, direction, speed, model):
+        """A car handed over by a neighbouring intersection; returns False if its lane is full"""
+        car = self.car_pool.acquire(self.window_width, self.window_height, speed, direction,
+                                    clock=self.clock, model=model)
+        if self._add_if_clear(car):
+            return True
+        self._discard_car(car)
+        return False
+
+    def _spawn_replayed(self, events):
+        """Rebuild the cars and pedestrians the recording spawned on this tick"""
+        w, h = self.window_width, self.window_height
+        for kind, values in events:
+            if kind == Recording.CAR:
+                direction, speed, category, model = values
+                car = self.car_pool.acquire(w, h, speed, Recording.DIRECTIONS[direction],
+                                            clock=self.clock, model=(category, model))
+                self.add_car(car)
+                if self.recorder:
+                    self.recorder.car(self.ticks, car)
+            elif kind == Recording.PEDESTRIAN:
+                direction, speed = values
+                pedestrian = self.ped_pool.acquire(w, h, speed, Recording.DIRECTIONS[direction])
+                self.add_pedestrian(pedestrian)
+                if self.recorder:
+                    self.recorder.pedestrian(self.ticks, pedestrian)
+
+    def _update_cars(self, env, scale):
+        """Check every car against other cars, pedestrians and its stop line, then move it"""
+        for car in self.cars:
+            will_crash_car = False
+            will_crash_pedestrian = False
+            car.apply_environment(env)
+            look = int(20 * env.caution)
+
+            # Check collision with nearby cars
+            for other_car in self.car_grid.query_ahead(car, look):
+                if car != other_car and car.will_collide_soon(other_car, look_ahead_distance=look):
+                    will_crash_car = True
+                    break
+
+            # Check collision with nearby pedestrians
+            for pedestrian in self.ped_grid.query_ahead(car, look):
+                if car.will_collide_soon(pedestrian, look_ahead_distance=look):
+                    will_crash_pedestrian = True
+                    break
+
+            if will_crash_car or will_crash_pedestrian:
+                car.stop()
+                self._horn(car)
+                self._mark_stopped(car)
+            else:
+                current_stop_line = self.stop_lines[car.direction]
+                current_traffic_light = self.traffic_lights[car.direction]
+
+                extra = int(12 * env.caution)
+                stop_rect = current_stop_line.inflate(extra, extra)
+                if car.check_stop_line(stop_rect):
+                    if current_traffic_light.get_color() == "red":
+                        if not car.is_emergency:
+                            car.stop()
+                            self._mark_stopped(car)
+                    else:
+                        car.resume()
+                        self._mark_moving(car)
+                        self.demand.crossing(car.direction)
+                else:
+                    car.resume()
+                    self._mark_moving(car)
+
+            car.update(scale)
+            self.car_grid.move(car)
+
+    def _update_pedestrians(self, scale):
+        """Stop pedestrians that are about to walk into a car, then move them"""
+        for pedestrian in self.pedestrians:
+            will_crash = False
+
+            # Check collision with nearby cars
+            for car in self.car_grid.query_ahead(pedestrian, 20):
+                if pedestrian.will_collide_soon(car):
+                    will_crash = True
+                    break
+
+            if will_crash:
+                pedestrian.stop()
+            else:
+                pedestrian.resume()
+
+            pedestrian.update(scale)
+            self.ped_grid.move(pedestrian)
+
+    def _remove_off_screen(self):
+        """Drop entities that have left the screen and count them as crossed"""
+        w, h = self.window_width, self.window_height
+
+        # One pass per list: keepers are moved down in place, the tail is cut off at the end
+        cars = self.cars
+        keep = 0
+        for car in cars:
+            if is_entity_off_screen(car, w, h):
+                self.car_grid.remove(car)
+                self._retire_car(car)
+            else:
+                cars[keep] = car
+                keep += 1
+        del cars[keep:]
+
+        pedestrians = self.pedestrians
+        keep = 0
+        for ped in pedestrians:
+            if is_entity_off_screen(ped, w, h):
+                self.ped_grid.remove(ped)
+                self.ped_pool.release(ped)
+                self.peds_crossed += 1
+            else:
+                pedestrians[keep] = ped
+                keep += 1
+        del pedestrians[keep:]
+
+    def _step_vector(self, env, scale):
+        """Same tick as _update_cars/_update_pedestrians/_remove_off_screen, done on arrays.
+        Cars all decide from the positions at the start of the tick."""
+        kin = self.kinematics
+        prof = self.profiler
+        red = {d for d, light in self.traffic_lights.items() if light.get_color() == "red"}
+        crashed, started_waiting, stopped_waiting = kin.step_cars(env, red, scale)
+
+        # only the cars involved need Python-level work
+        cars = kin.cars
+        for i in crashed.nonzero()[0]:
+            self._horn(cars[i])
+        stopping = started_waiting.nonzero()[0]
+        if len(stopping):
+            queued = kin.before_stop_line()
+            for i in stopping:
+                self._mark_stopped(cars[i], bool(queued[i]))
+        for i in stopped_waiting.nonzero()[0]:
+            self._mark_moving(cars[i])
+        if prof:
+            prof.lap("cars")
+
+        kin.step_pedestrians(scale)
+        if prof:
+            prof.lap("pedestrians")
+
+        removed_cars, removed_peds = kin.cull()
+        for car in removed_cars:
+            self._retire_car(car)
+        for ped in removed_peds:
+            self.ped_pool.release(ped)
+        self.peds_crossed += len(removed_peds)
+        if prof:
+            prof.lap("removal")
+
+    def sync_sprites(self):
+        """Bring sprite positions up to date before drawing (only needed with the vector backend)"""
+        if self.kinematics:
+            self.kinematics.sync_sprites()
+
+    def _moving(self):
+        if self.kinematics:
+            return self.kinematics.moving()
+        return any(car.speed for car in self.cars) or any(ped.speed for ped in self.pedestrians)
+
+    def skip_idle(self, dt, max_ticks):
+        """
+        Jump over up to max_ticks ticks of dt in which nothing can happen, and return how many
+        were skipped. That is the case while the weather sits at its targets and no entity
+        moves: every car and pedestrian stays stopped for the same reason until the next
+        scheduled event (a spawn, a light change or new weather). The clock jumps straight to
+        the tick before that event and reads exactly what step(dt) would have made it.
+        Never skips with telemetry (which logs every tick) or while replaying.
+        """
+        if self.telemetry or self.replay or max_ticks <= 0:
+            return 0
+        # a weather transition changes the environment every tick, so it is stepped through
+        if not self.weather_system.settled() or self._moving():
+            return 0
+
+        # stop short of the tick the next event falls on; step() takes that one
+        wait = self.scheduler.next_deadline() - self.clock.now()
+        ticks = max_ticks if wait == math.inf else min(max_ticks, math.ceil(wait / dt) - 2)
+        if ticks <= 0:
+            return 0
+        first = self.ticks + 1
+        self.clock.advance(dt, ticks)
+        self.ticks += ticks
+        if self.recorder:
+            # the log only keeps changes of dt, plus the tick count
+            self.recorder.tick(first, dt)
+            self.recorder.tick(self.ticks, dt)
+        self.time = self.clock.now() - self.start_time
+        return ticks
+
+    def step(self, dt):
+        """Advance the simulation by one tick of dt seconds and return the environment state"""
+        prof = self.profiler
+        self.clock.advance(dt)
+        self.time = self.clock.now() - self.start_time
+        self.ticks += 1
+        rec = self.recorder
+        if rec:
+            rec.tick(self.ticks, dt)
+
+        scheduler = self.scheduler
+        due = scheduler.pop_due(self.clock.now())
+
+        events = self.replay.events_at(self.ticks) if self.replay else ()
+        for kind, values in events:
+            if kind == Recording.WEATHER:
+                rain, fog, time_of_day = values
+                self.weather_system.set_targets(rain, fog, Recording.TIMES_OF_DAY[time_of_day])
+
+        weather = self.weather_system
+        if WEATHER_CHANGE in due:
+            if weather.change_due():
+                weather.retarget()
+            scheduler.schedule(WEATHER_CHANGE, weather.next_change())
+        self.env = weather.update(dt, poll=False)
+        if weather.target_changes != self._weather_changes:
+            self._weather_changes = weather.target_changes
+            if rec:
+                rec.weather(self.ticks, weather.target_rain, weather.target_fog, weather.target_time)
+        if prof:
+            prof.lap("weather")
+
+        if self.replay:
+            self._spawn_replayed(events)
+        else:
+            self._spawn(due)
+        if prof:
+            prof.lap("spawn")
+
+        # Update controller
+        if PHASE_CHANGE in due:
+            self.controller.update()
+            scheduler.schedule(PHASE_CHANGE, self.controller.next_change())
+        if self.controller.current_phase != self._phase:
+            self._phase = self.controller.current_phase
+            if rec:
+                rec.phase(self.ticks, self._phase)
+            if self.replay:
+                self.replay.check_phase(self.ticks, self._phase)
+        if prof:
+            prof.lap("controller")
+
+        scale = dt / SPEED_TICK
+        if self.kinematics:
+            self._step_vector(self.env, scale)
+        else:
+            self._update_cars(self.env, scale)
+            if prof:
+                prof.lap("cars")
+            self._update_pedestrians(scale)
+            if prof:
+                prof.lap("pedestrians")
+            self._remove_off_screen()
+            if prof:
+                prof.lap("removal")
+
+        if self.telemetry:
+            self._write_telemetry()
+            if prof:
+                prof.lap("telemetry")
+        return self.env
+
+    def _write_telemetry(self):
+        """Append one record per car on the road to the telemetry writer"""
+        cars = self.cars
+        if not cars:
+            return
+        light = {d: Telemetry.LIGHT_CODES[l.get_color()] for d, l in self.traffic_lights.items()}
+        if self.kinematics:
+            # straight from the arrays, the sprites may not be synced
+            self.telemetry.append(self.ticks, *self.kinematics.car_telemetry(light))
+            return
+        self.telemetry.append(self.ticks, [car.vehicle_id for car in cars],
+                              [car.rect.centerx for car in cars], [car.rect.centery for car in cars],
+                              [car.speed for car in cars], [light[car.direction] for car in cars])
+
+    def finish(self):
+        """Silence remaining vehicles at the end of a run"""
+        self.audio.stop_all()
+
+    def get_stats(self):
+        """Return the end-of-run statistics (same keys as main.LAST_STATS)"""
+        waits = self.finished_waits + [st["wait_total"] for st in self.car_wait.values()]
+        avg_car_wait = sum(waits) / len(waits) if waits else 0.0
+
+        return {
+            "sim_time": self.time,
+            "cars_crossed": self.cars_crossed,
+            "peds_crossed": self.peds_crossed,
+            "avg_car_wait": avg_car_wait
+        }
+
+
+def init_headless():
+    """
+    Return the intersection size for a run without a window. No pygame subsystem is started:
+    images are only decoded for their sizes and nothing is drawn or heard, so worker processes
+    start without a display or audio device.
+    """
+    background = Assets.surface(join('assets', 'intersection.png'))
+    return background.get_width(), background.get_height()
+
+
+def run_headless(config, duration, dt=1 / 60, backend="objects", seed=None, record=None, telemetry=None):
+    """
+    Run a simulation for duration simulated seconds as fast as possible and return its stats.
+    record    = path of a Recording log to write (None: no recording)
+    telemetry = directory for per-tick vehicle telemetry chunks (None: no telemetry)
+    """
+    window_width, window_height = init_headless()
+    recorder = None
+    if record:
+        # the seed has to be known up front to go into the log
+        seed = seed if seed is not None else random.randrange(2 ** 32)
+        recorder = Recording.Recorder(seed, config, (window_width, window_height), backend)
+    writer = Telemetry.TelemetryWriter(telemetry) if telemetry else None
+    sim = Simulation(window_width, window_height, config, verbose=False, backend=backend,
+                     clock=SimClock.FixedStepClock(), seed=seed, recorder=recorder,
+                     telemetry=writer)
+
+    ticks = int(duration / dt)
+    try:
+        done = 0
+        while done < ticks:
+            # idle stretches (nothing moving until the next event) are jumped over
+            done += sim.skip_idle(dt, ticks - done)
+            if done < ticks:
+                sim.step(dt)
+                done += 1
+    finally:
+        if writer:
+            writer.close()
+
+    sim.finish()
+    stats = sim.get_stats()
+    if recorder:
+        recorder.save(record, stats)
+    return stats
+
+
+def replay_headless(replay, backend=None):
+    """Re-run a Recording.Replay (or the path of one) as fast as possible and return its stats"""
+    if isinstance(replay, str):
+        replay = Recording.load(replay)
+    init_headless()
+    window_width, window_height = replay.size
+    sim = Simulation(window_width, window_height, replay.config, verbose=False,
+                     backend=backend or replay.backend, seed=replay.seed, replay=replay)
+
+    for dt in replay.dts():
+        sim.step(dt)
+
+    sim.finish()
+    return sim.get_stats()
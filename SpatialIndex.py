@@ -0,0 +1,100 @@
+# SpatialIndex.py
+import math
+
+
+class SpatialGrid:
+    """Uniform bucket grid over entity rects, so collision checks only look at nearby entities."""
+    def __init__(self, cell_size=64):
+        self.cell_size = cell_size
+        self._cells = {}         # (col, row) -> list of entities in that cell
+        self._entity_cells = {}  # id(entity) -> (col0, row0, col1, row1) it is stored under
+
+    def __len__(self):
+        return len(self._entity_cells)
+
+    def _cell_range(self, left, top, right, bottom):
+        cs = self.cell_size
+        return (math.floor(left / cs), math.floor(top / cs),
+                math.floor(right / cs), math.floor(bottom / cs))
+
+    def _add(self, entity, cells):
+        col0, row0, col1, row1 = cells
+        for col in range(col0, col1 + 1):
+            for row in range(row0, row1 + 1):
+                self._cells.setdefault((col, row), []).append(entity)
+        self._entity_cells[id(entity)] = cells
+
+    def _discard(self, entity, cells):
+        col0, row0, col1, row1 = cells
+        for col in range(col0, col1 + 1):
+            for row in range(row0, row1 + 1):
+                bucket = self._cells[(col, row)]
+                bucket.remove(entity)
+                if not bucket:
+                    del self._cells[(col, row)]
+
+    def insert(self, entity):
+        r = entity.rect
+        self._add(entity, self._cell_range(r.left, r.top, r.right, r.bottom))
+
+    def remove(self, entity):
+        cells = self._entity_cells.pop(id(entity), None)
+        if cells is not None:
+            self._discard(entity, cells)
+
+    def move(self, entity):
+        """Re-bucket an entity after its rect changed (no-op while it stays in the same cells)"""
+        r = entity.rect
+        cells = self._cell_range(r.left, r.top, r.right, r.bottom)
+        old = self._entity_cells[id(entity)]
+        if cells != old:
+            self._discard(entity, old)
+            self._add(entity, cells)
+
+    def query(self, left, top, right, bottom):
+        """Yield entities stored in any cell overlapping the box (an entity may repeat)"""
+        col0, row0, col1, row1 = self._cell_range(left, top, right, bottom)
+        cells = self._cells
+        for col in range(col0, col1 + 1):
+            for row in range(row0, row1 + 1):
+                bucket = cells.get((col, row))
+                if bucket:
+                    yield from bucket
+
+    def query_ahead(self, entity, look_ahead_distance):
+        """Yield candidates for entity.will_collide_soon(other, look_ahead_distance)"""
+        r = entity.rect
+        left, top, right, bottom = r.left, r.top, r.right, r.bottom
+
+        # Same shift as will_collide_soon, widened by a pixel so rounding never drops a candidate
+        if entity.direction == "N":
+            top -= look_ahead_distance
+            bottom -= look_ahead_distance
+        elif entity.direction == "S":
+            top += look_ahead_distance
+            bottom += look_ahead_distance
+        elif entity.direction == "E":
+            left += look_ahead_distance
+            right += look_ahead_distance
+        elif entity.direction == "W":
+            left -= look_ahead_distance
+            right -= look_ahead_distance
+
+        return self.query(left - 1, top - 1, right + 1, bottom + 1)
+
+
+class LaneIndex:
+    """Per-direction queues of cars in spawn order (front of the queue = furthest along)."""
+    def __init__(self, directions=("N", "S", "E", "W")):
+        self.lanes = {d: [] for d in directions}
+
+    def add(self, car):
+        self.lanes[car.direction].append(car)
+
+    def remove(self, car):
+        self.lanes[car.direction].remove(car)
+
+    def last(self, direction):
+        """Return the car closest to the spawn point of a lane, or None"""
+        lane = self.lanes[direction]
+        return lane[-1] if lane else None
@@ -0,0 +1,202 @@
+# Sprites.py
+# Drawing of the Car/Pedestrian state records: images are looked up in the Assets registry
+# by car model and pedestrian animation state, so the records themselves hold no surfaces.
+import functools
+import math
+import pygame
+import Assets
+
+
+# Headlight sprites are cached per (direction, length, alpha), quantized by these steps
+HEADLIGHT_LENGTH_STEP = 4
+HEADLIGHT_ALPHA_STEP = 8
+HEADLIGHT_GLOW_RADIUS = 18
+
+
+@functools.lru_cache(maxsize=128)
+def _headlight_sprite(direction, length, width, alpha):
+    """
+    Pre-render one headlight cone into a small SRCALPHA surface.
+    Returns (surface, (x, y) of the headlight source inside the surface).
+    """
+    glow = HEADLIGHT_GLOW_RADIUS
+    if direction == "N":
+        size, start = (width, length + glow + 1), (width // 2, length)
+    elif direction == "S":
+        size, start = (width, length + glow + 1), (width // 2, glow)
+    elif direction == "E":
+        size, start = (length + glow + 1, width), (glow, width // 2)
+    else:  # "W"
+        size, start = (length + glow + 1, width), (length, width // 2)
+
+    sprite = pygame.Surface(size, pygame.SRCALPHA)
+    sx, sy = start
+
+    def cone_points(cone_length, cone_width):
+        if direction == "N":
+            return [start, (sx - cone_width // 2, sy - cone_length), (sx + cone_width // 2, sy - cone_length)]
+        if direction == "S":
+            return [start, (sx - cone_width // 2, sy + cone_length), (sx + cone_width // 2, sy + cone_length)]
+        if direction == "E":
+            return [start, (sx + cone_length, sy - cone_width // 2), (sx + cone_length, sy + cone_width // 2)]
+        return [start, (sx - cone_length, sy - cone_width // 2), (sx - cone_length, sy + cone_width // 2)]
+
+    # --- Draw a soft main cone (transparent) ---
+    pygame.draw.polygon(sprite, (255, 245, 210, alpha), cone_points(length, width))
+
+    # --- Inner brighter cone ---
+    inner_w = int(width * 0.55)
+    inner_len = int(length * 0.65)
+    inner_alpha = int(alpha * 0.7)
+    pygame.draw.polygon(sprite, (255, 255, 235, inner_alpha), cone_points(inner_len, inner_w))
+
+    # --- Glow around the headlight source (softens the "triangle" look) ---
+    pygame.draw.circle(sprite, (255, 255, 220, int(alpha * 0.7)), start, 10)
+    pygame.draw.circle(sprite, (255, 255, 220, int(alpha * 0.35)), start, glow)
+    return sprite, start
+
+
+# Emergency beacon glow: intensity is quantized to this many levels
+GLOW_INTENSITY_LEVELS = 16
+
+
+@functools.lru_cache(maxsize=64)
+def _glow_sprite(color, radius, level):
+    """Pre-render a glowing light (layered circles) at intensity level / GLOW_INTENSITY_LEVELS"""
+    glow_intensity = level / GLOW_INTENSITY_LEVELS
+    glow_surface = pygame.Surface((radius * 4, radius * 4), pygame.SRCALPHA)
+
+    # Draw multiple circles with decreasing opacity for glow effect
+    for i in range(5, 0, -1):
+        current_radius = radius * i / 2
+        alpha = int((255 / (i + 1)) * glow_intensity)
+        glow_color = (*color, alpha)
+        pygame.draw.circle(glow_surface, glow_color,
+                           (radius * 2, radius * 2), int(current_radius))
+    return glow_surface
+
+
+@functools.lru_cache(maxsize=None)
+def car_image(model_key, direction):
+    """Pre-rotated image of a car model ((category index, model index), as in Car.model_key)"""
+    car_models = Assets.get_car_models()
+    category_index, model_index = model_key
+    return car_models[list(car_models)[category_index]][model_index]["images"][direction]
+
+
+def draw_glowing_light(surface, color, center, radius, glow_intensity=1.0):
+    """Draw a glowing light effect with multiple layered circles"""
+    # Pre-rendered glow for this color/size, intensity quantized so sprites get reused
+    level = round(glow_intensity * GLOW_INTENSITY_LEVELS)
+    glow_surface = _glow_sprite(color, radius, level)
+
+    # Blit the glow surface onto the main surface
+    return surface.blit(glow_surface,
+                        (center[0] - radius * 2, center[1] - radius * 2))
+
+
+def draw_car(surface, car, env=None):
+    """Draw the car (and its lights) and return the screen area that was touched"""
+    image = car_image(car.model_key, car.direction)
+    dirty = surface.blit(image, car.rect)
+
+    if env is not None:
+        lit = draw_headlights(surface, car, env)
+        if lit:
+            dirty = dirty.union(lit)
+
+    surface.blit(image, car.rect)
+    # Draw emergency lights if this is a police car or ambulance
+    if car.is_emergency:
+        # Calculate light positions based on car direction
+        light_offset = 38
+
+        if car.direction == "N":
+            left_light = (car.rect.centerx - 8, car.rect.top + light_offset)
+            right_light = (car.rect.centerx + 8, car.rect.top + light_offset)
+        elif car.direction == "S":
+            left_light = (car.rect.centerx + 8, car.rect.bottom - light_offset)
+            right_light = (car.rect.centerx - 8, car.rect.bottom - light_offset)
+        elif car.direction == "E":
+            left_light = (car.rect.right - light_offset, car.rect.centery - 8)
+            right_light = (car.rect.right - light_offset, car.rect.centery + 8)
+        elif car.direction == "W":
+            left_light = (car.rect.left + light_offset, car.rect.centery + 8)
+            right_light = (car.rect.left + light_offset, car.rect.centery - 8)
+
+        # Determine light colors based on vehicle type
+        if car.is_ambulance:
+            # Ambulance: red and white lights
+            light_color_1 = (255, 0, 0)  # Red
+            light_color_2 = (255, 255, 255)  # White
+        else:
+            # Police: red and blue lights
+            light_color_1 = (0, 100, 255)  # Blue
+            light_color_2 = (255, 0, 0)  # Red
+
+        # Alternate between lights
+        light_pulse = abs(math.sin(car.light_time * 0.1)) * 0.5 + 0.5
+        if int(car.light_time / 15) % 2 == 0:
+            glow = draw_glowing_light(surface, light_color_1, left_light, 8, light_pulse)
+        else:
+            glow = draw_glowing_light(surface, light_color_2, right_light, 8, light_pulse)
+        dirty = dirty.union(glow)
+    return dirty
+
+
+def draw_headlights(surface, car, env):
+    """
+    Soft, transparent headlights.
+    Turn on when raining/foggy or at dusk/night.
+    """
+    if env is None:
+        return
+
+    # --- When to turn on headlights ---
+    rain = getattr(env, "rain", 0.0)
+    fog = getattr(env, "fog", 0.0)
+    time_of_day = getattr(env, "time_of_day", "day")
+    visibility = getattr(env, "visibility", 1.0)
+
+    headlights_on = (rain >= 0.15) or (fog >= 0.15) or (time_of_day in ("dusk", "night"))
+    if not headlights_on:
+        return
+
+    # --- Shape parameters ---
+    base_len = 120
+    length = int(base_len * (0.55 + 0.75 * max(0.2, visibility)))  # shorter when foggy
+    width = 80
+
+    # --- Intensity (alpha) ---
+    strength = 0.35 + 0.55 * min(1.0, rain + fog)
+    if time_of_day == "night":
+        strength += 0.25
+    alpha = int(140 * min(1.0, strength))
+    alpha = int(alpha * (0.6 + 0.4 * max(0.2, visibility)))  # dim a bit in heavy fog
+
+    # Quantize so nearby weather states share one cached sprite
+    length = length - length % HEADLIGHT_LENGTH_STEP
+    alpha = alpha - alpha % HEADLIGHT_ALPHA_STEP
+
+    sprite, (ox, oy) = _headlight_sprite(car.direction, length, width, alpha)
+
+    cx, cy = car.rect.centerx, car.rect.centery
+
+    # --- Headlight source: front middle of the car ---
+    if car.direction == "N":
+        start = (cx, car.rect.top)
+    elif car.direction == "S":
+        start = (cx, car.rect.bottom)
+    elif car.direction == "E":
+        start = (car.rect.right, cy)
+    else:  # "W"
+        start = (car.rect.left, cy)
+
+    # IMPORTANT: normal alpha blit (NO BLEND_RGBA_ADD)
+    return surface.blit(sprite, (start[0] - ox, start[1] - oy))
+
+
+def draw_pedestrian(surface, pedestrian):
+    """Draw a pedestrian on surface and return the area that was touched"""
+    image = Assets.get_pedestrian_frames()[(pedestrian.direction, pedestrian.animation_state)]
+    return surface.blit(image, pedestrian.rect)
@@ -0,0 +1,128 @@
+# Telemetry.py
+# Per-tick, per-vehicle trajectories streamed to disk in fixed-size columnar chunks.
+import os
+import queue
+import threading
+from os.path import join
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional: only telemetry and the vectorized backend need it
+    np = None
+
+LIGHT_CODES = {"green": 0, "yellow": 1, "red": 2}
+
+# Column name -> dtype of one record (one vehicle on one tick)
+FIELDS = {
+    "tick": "uint32",
+    "vehicle": "uint32",   # Car.vehicle_id, unique within a run
+    "x": "float32",        # rect center, pixels
+    "y": "float32",
+    "speed": "float32",    # pixels per Simulation.SPEED_TICK (1/60 s)
+    "stopped": "bool",
+    "light": "uint8",      # LIGHT_CODES of the vehicle's approach
+}
+
+
+class TelemetryWriter:
+    """
+    Appends records to preallocated column buffers; a background thread writes every full
+    buffer to <directory>/chunk_NNNNN.npz (one array per column) and hands it back for reuse,
+    so memory stays at buffers * chunk_rows records however long the run is.
+    """
+    def __init__(self, directory, chunk_rows=1 << 16, buffers=4):
+        """
+        directory  = output directory (created if needed)
+        chunk_rows = records per buffer, and so per chunk file
+        buffers    = buffers in the pool; the simulation only waits if all of them are still
+                     queued for writing
+        """
+        if np is None:
+            raise ImportError("numpy is required for telemetry (pip install numpy)")
+
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        self.chunk_rows = chunk_rows
+        self.rows = 0  # records written so far
+
+        self._free = queue.Queue()
+        for _ in range(buffers):
+            self._free.put({name: np.empty(chunk_rows, dtype) for name, dtype in FIELDS.items()})
+        self._pending = queue.Queue()
+        self._buffer = self._free.get()
+        self._fill = 0
+        self._chunks = 0
+        self._error = None
+
+        self._thread = threading.Thread(target=self._flush_loop, name="telemetry-writer", daemon=True)
+        self._thread.start()
+
+    def _flush_loop(self):
+        while True:
+            item = self._pending.get()
+            if item is None:
+                return
+            index, buffer, count = item
+            try:
+                np.savez(join(self.directory, f"chunk_{index:05d}.npz"),
+                         **{name: column[:count] for name, column in buffer.items()})
+            except Exception as e:  # reported on the simulation thread
+                self._error = e
+            self._free.put(buffer)
+
+    def _hand_off(self):
+        self._pending.put((self._chunks, self._buffer, self._fill))
+        self._chunks += 1
+        self._buffer = self._free.get()
+        self._fill = 0
+
+    def append(self, tick, vehicle, x, y, speed, light):
+        """Add one record per vehicle; every argument but tick is a sequence of the same length"""
+        if self._error:
+            raise self._error
+        count = len(vehicle)
+        start = 0
+        while start < count:
+            if self._fill == self.chunk_rows:
+                self._hand_off()
+            n = min(count - start, self.chunk_rows - self._fill)
+            a, b = self._fill, self._fill + n
+            buf = self._buffer
+            buf["tick"][a:b] = tick
+            buf["vehicle"][a:b] = vehicle[start:start + n]
+            buf["x"][a:b] = x[start:start + n]
+            buf["y"][a:b] = y[start:start + n]
+            buf["speed"][a:b] = speed[start:start + n]
+            buf["stopped"][a:b] = buf["speed"][a:b] == 0
+            buf["light"][a:b] = light[start:start + n]
+            self._fill = b
+            start += n
+        self.rows += count
+
+    def close(self):
+        """Flush the partly filled buffer and wait until everything is on disk"""
+        if self._fill:
+            self._hand_off()
+        self._pending.put(None)
+        self._thread.join()
+        if self._error:
+            raise self._error
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def load(directory, columns=None):
+    """Read every chunk of a telemetry directory back as {column: array}"""
+    names = sorted(name for name in os.listdir(directory) if name.startswith("chunk_"))
+    columns = list(columns or FIELDS)
+    parts = {name: [] for name in columns}
+    for name in names:
+        with np.load(join(directory, name)) as chunk:
+            for column in columns:
+                parts[column].append(chunk[column])
+    return {column: np.concatenate(arrays) if arrays else np.empty(0, FIELDS[column])
+            for column, arrays in parts.items()}
@@ -1,65 +1,31 @@
 import pygame
-from os.path import join
-import time
+import Assets
 
 class TrafficLight(pygame.sprite.Sprite):
     def __init__(self, x, y, direction, initial_state="red"):
         super().__init__()
-        self.last_change_time = time.time()
         self.x=x
         self.y=y
         self.direction = direction
-        self.images = {
-            'red': pygame.image.load(join('assets','trafficlight', 'REDtraffic.png')).convert_alpha(),
-            'yellow': pygame.image.load(join('assets','trafficlight', 'YELLOWtraffic.png')).convert_alpha(),
-            'green': pygame.image.load(join('assets','trafficlight', 'GREENtraffic.png')).convert_alpha()
-        }
-        for color in self.images:
-            self.images[color] = pygame.transform.scale_by(self.images[color], 0.07)
+        # scaled and rotated once per direction by Assets, shared by every light of that approach
+        self.images = Assets.get_traffic_light_images(direction)
 
         self.current_color = initial_state
         self.image = self.images[self.current_color]
-        self._preload_images()
+        self._place()
 
-    def _preload_images(self):
+    def _place(self):
         if self.direction == "N":
-            for color in self.images:
-                self.images[color] = pygame.transform.rotate(self.images[color], 180)
-            # Update current image after rotation
-            self.image = self.images[self.current_color]
-            # Set position
             self.rect = self.image.get_frect(center=(self.x / 2 - 90, self.y / 2 - 127))
-
-
-
         elif self.direction == "S":
-            # Update current image after rotation
-            self.image = self.images[self.current_color]
-            # Set position
             self.rect = self.image.get_frect(center=(self.x / 2 + 90, self.y / 2 + 127))
-
-
-
-
         elif self.direction == "E":
-            for color in self.images:
-                self.images[color] = pygame.transform.rotate(self.images[color], -90)
-            # Update current image after rotation
-            self.image = self.images[self.current_color]
-            # Set position
             self.rect = self.image.get_frect(center=(self.x / 2 -120, self.y / 2 + 94))
-
-
-
         elif self.direction == "W":
-            for color in self.images:
-                self.images[color] = pygame.transform.rotate(self.images[color], 90)
-            # Update current image after rotation
-            self.image = self.images[self.current_color]
-            # Set position
             self.rect = self.image.get_frect(center=(self.x / 2 + 120, self.y / 2 - 94))
+
     def draw(self, screen):
-        screen.blit(self.image, self.rect)
+        return screen.blit(self.image, self.rect)
 
     def change_color(self, color):
         if color in self.images:
@@ -1,57 +1,206 @@
-import time
+import math
+import SimClock
+
+
+class ApproachDemand:
+    """
+    Per-approach queue lengths and arrival rates, kept up to date by the engine as cars
+    arrive, stop and move off, so the controller never has to scan the cars.
+    """
+    def __init__(self, clock, directions=("N", "S", "E", "W"), rate_window=30.0):
+        """
+        clock       = time source with now() in seconds
+        rate_window = time constant (seconds) of the exponentially decaying arrival rate
+        """
+        self.clock = clock
+        self.rate_window = rate_window
+        self.queue = dict.fromkeys(directions, 0)  # cars stopped before the stop line of each approach
+        self.in_box = 0  # cars stopped past their stop line, inside the intersection
+        self._rate = dict.fromkeys(directions, 0.0)
+        self._rate_time = dict.fromkeys(directions, clock.now())
+        self.last_crossing = dict.fromkeys(directions, -math.inf)
+
+    def arrived(self, direction):
+        now = self.clock.now()
+        self._rate[direction] = self.arrival_rate(direction, now) + 1.0 / self.rate_window
+        self._rate_time[direction] = now
+
+    def stopped(self, direction, queued=True):
+        """A car stopped; queued is False when it stopped inside the intersection"""
+        if queued:
+            self.queue[direction] += 1
+        else:
+            self.in_box += 1
+
+    def resumed(self, direction, queued=True):
+        if queued:
+            self.queue[direction] -= 1
+        else:
+            self.in_box -= 1
+
+    def crossing(self, direction):
+        self.last_crossing[direction] = self.clock.now()
+
+    def arrival_rate(self, direction, now=None):
+        """Recent arrivals per second on an approach"""
+        now = self.clock.now() if now is None else now
+        return self._rate[direction] * math.exp(-(now - self._rate_time[direction]) / self.rate_window)
+
+    def pressure(self, directions, horizon):
+        """Cars waiting on the approaches plus those expected within horizon seconds"""
+        now = self.clock.now()
+        return sum(self.queue[d] + self.arrival_rate(d, now) * horizon for d in directions)
+
 
 class TrafficLightController:
-    def __init__(self, north, south, east, west):
+    def __init__(self, north, south, east, west, clock=None, mode="fixed", demand=None):
+        # clock: anything with now() in seconds (wall clock by default)
+        # mode: "fixed" (5 s greens) or "adaptive" (greens sized from demand, an ApproachDemand)
+        self.clock = clock if clock is not None else SimClock.WALL_CLOCK
+        if mode == "adaptive" and demand is None:
+            raise ValueError("the adaptive mode needs an ApproachDemand")
+        self.mode = mode
+        self.demand = demand
         self.north = north
         self.south = south
         self.east = east
         self.west = west
 
-        self.last_change = time.time()
+        self.last_change = self.clock.now()
         self.green_duration = 5
         self.yellow_duration = 2
         self.current_phase = "NS"  # North-South green, East-West red
 
+        # Adaptive greens: base + extension per car queued when the green started, within min/max,
+        # ended early once the green approaches are empty and someone waits on the red ones.
+        # Never extended while cars are stuck in the box: a longer green cannot move them.
+        self.base_green_duration = 5
+        self.max_green_duration = 15
+        self.extension_per_car = 0.8
+        self.planned_green = self.base_green_duration
+        self.gap_time = 1.0  # seconds without an expected arrival that end a green early
+        # Adaptive mode only: all red after each yellow, so the cars that entered on yellow
+        # clear the box before the crossing queue starts
+        self.all_red_duration = float(__import__("os").environ.get("AR", 1.5))
+
         # Initialize lights
         self.north.change_color("green")
         self.south.change_color("green")
         self.east.change_color("red")
         self.west.change_color("red")
 
+    def _plan_green(self, directions):
+        """Size a new green from the cars already waiting on its approaches"""
+        if self.mode == "adaptive":
+            waiting = sum(self.demand.queue[d] for d in directions)
+            self.planned_green = min(self.max_green_duration,
+                                     self.base_green_duration + self.extension_per_car * waiting)
+
+    def _entered_on_yellow(self, directions):
+        return self.mode == "adaptive" and any(self.demand.last_crossing[d] >= self.clock.now() - float(__import__("os").environ.get("WIN", 4)) for d in directions)
+
+    def _green_over(self, elapsed, green, red):
+        if self.mode != "adaptive":
+            return elapsed >= self.green_duration
+        if elapsed < self.base_green_duration:
+            return False
+
+        demand = self.demand
+        if demand.in_box:
+            return elapsed >= self.planned_green
+        if not any(demand.queue[d] for d in red):
+            # nobody waiting across: switching would only stop traffic
+            return False
+        if elapsed >= self.max_green_duration:
+            return True
+        if not any(demand.queue[d] for d in green) and demand.pressure(green, self.gap_time) < 1:
+            # queue discharged and no car expected soon: gap out
+            return True
+        if elapsed < self.planned_green:
+            return False
+        # past the planned green: keep it only while this side still has more demand
+        horizon = self.yellow_duration + self.base_green_duration
+        return demand.pressure(green, horizon) <= demand.pressure(red, horizon)
+
+    def next_change(self):
+        """
+        Earliest clock time at which update() may switch the phase. Adaptive greens past their
+        minimum depend on the demand, so this is then a time already passed (poll every tick),
+        or the maximum green while nobody waits (the engine reschedules when a car stops).
+        """
+        if self.current_phase in ("NS_YELLOW", "EW_YELLOW"):
+            return self.last_change + self.yellow_duration
+        if self.current_phase in ("NS_ALL_RED", "EW_ALL_RED"):
+            return self.last_change + self.all_red_duration
+        if self.mode != "adaptive":
+            return self.last_change + self.green_duration
+        red = ("E", "W") if self.current_phase == "NS" else ("N", "S")
+        if not self.demand.in_box and not any(self.demand.queue[d] for d in red):
+            return self.clock.now() + self.max_green_duration
+        return self.last_change + self.base_green_duration
+
     def update(self):
-        current_time = time.time()
+        current_time = self.clock.now()
         elapsed = current_time - self.last_change
 
         if self.current_phase == "NS":
             # North-South green
-            if elapsed >= self.green_duration:
+            if self._green_over(elapsed, ("N", "S"), ("E", "W")):
                 self.north.change_color("yellow")
                 self.south.change_color("yellow")
                 self.current_phase = "NS_YELLOW"
                 self.last_change = current_time
 
         elif self.current_phase == "NS_YELLOW":
-            if elapsed >= self.yellow_duration:
+            if elapsed >= self.yellow_duration and self._entered_on_yellow(("N", "S")):
+                self.north.change_color("red")
+                self.south.change_color("red")
+                self.current_phase = "NS_ALL_RED"
+                self.last_change = current_time
+            elif elapsed >= self.yellow_duration:
                 self.north.change_color("red")
                 self.south.change_color("red")
                 self.east.change_color("green")
                 self.west.change_color("green")
                 self.current_phase = "EW"
                 self.last_change = current_time
+                self._plan_green(("E", "W"))
 
         elif self.current_phase == "EW":
             # East-West green
-            if elapsed >= self.green_duration:
+            if self._green_over(elapsed, ("E", "W"), ("N", "S")):
                 self.east.change_color("yellow")
                 self.west.change_color("yellow")
                 self.current_phase = "EW_YELLOW"
                 self.last_change = current_time
 
         elif self.current_phase == "EW_YELLOW":
-            if elapsed >= self.yellow_duration:
+            if elapsed >= self.yellow_duration and self._entered_on_yellow(("E", "W")):
+                self.east.change_color("red")
+                self.west.change_color("red")
+                self.current_phase = "EW_ALL_RED"
+                self.last_change = current_time
+            elif elapsed >= self.yellow_duration:
                 self.east.change_color("red")
                 self.west.change_color("red")
                 self.north.change_color("green")
                 self.south.change_color("green")
                 self.current_phase = "NS"
-                self.last_change = current_time
\ No newline at end of file
+                self.last_change = current_time
+                self._plan_green(("N", "S"))
+
+        elif self.current_phase == "NS_ALL_RED":
+            if elapsed >= self.all_red_duration:
+                self.east.change_color("green")
+                self.west.change_color("green")
+                self.current_phase = "EW"
+                self.last_change = current_time
+                self._plan_green(("E", "W"))
+
+        elif self.current_phase == "EW_ALL_RED":
+            if elapsed >= self.all_red_duration:
+                self.north.change_color("green")
+                self.south.change_color("green")
+                self.current_phase = "NS"
+                self.last_change = current_time
+                self._plan_green(("N", "S"))
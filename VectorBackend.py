@@ -0,0 +1,295 @@
+# VectorBackend.py
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional: only the vectorized backend needs it
+    np = None
+
+# Direction codes and unit movement per code (screen coordinates, y grows downwards)
+DIRECTION_CODES = {"N": 0, "S": 1, "E": 2, "W": 3}
+DIRECTION_NAMES = ("N", "S", "E", "W")
+PED_STATES = ("idle", "left_foot", "right_foot")
+
+if np is not None:
+    DX = np.array([0.0, 0.0, 1.0, -1.0])
+    DY = np.array([-1.0, 1.0, 0.0, 0.0])
+    PED_NEXT_STATE = np.array([1, 2, 1], np.int8)  # idle -> left, left -> right, right -> left
+
+
+class EntityArrays:
+    """Struct-of-arrays storage: one NumPy column per field, grown by doubling, compacted on removal."""
+    def __init__(self, fields, capacity=64):
+        self.n = 0
+        self.capacity = capacity
+        self._data = {name: np.zeros(capacity, dtype) for name, dtype in fields.items()}
+
+    def __getitem__(self, name):
+        # view of the live rows only
+        return self._data[name][:self.n]
+
+    def __setitem__(self, name, values):
+        self._data[name][:self.n] = values
+
+    def append(self, **values):
+        if self.n == self.capacity:
+            self.capacity *= 2
+            for name, column in self._data.items():
+                grown = np.zeros(self.capacity, column.dtype)
+                grown[:self.n] = column[:self.n]
+                self._data[name] = grown
+        for name, value in values.items():
+            self._data[name][self.n] = value
+        self.n += 1
+
+    def keep(self, mask):
+        """Drop every row where mask is False, keeping the order of the others"""
+        count = int(np.count_nonzero(mask))
+        for column in self._data.values():
+            column[:count] = column[:self.n][mask]
+        self.n = count
+
+
+def _look_ahead_hits(a, look, b, exclude_self, block=256):
+    """For each row of a, True if its rect moved look pixels forward overlaps any rect of b"""
+    hits = np.zeros(a.n, bool)
+    if a.n == 0 or b.n == 0:
+        return hits
+
+    code = a["dir"]
+    fx = a["x"] + DX[code] * look
+    fy = a["y"] + DY[code] * look
+    fr = fx + a["w"]
+    fb = fy + a["h"]
+
+    # sweep along x: sorted rows only meet the b rows whose left edge falls in their x span
+    order_a = np.argsort(fx, kind="stable")
+    order_b = np.argsort(b["x"], kind="stable")
+    bx = b["x"][order_b]
+    by = b["y"][order_b]
+    br = bx + b["w"][order_b]
+    bb = by + b["h"][order_b]
+    max_width = float(b["w"].max())
+
+    for start in range(0, a.n, block):
+        rows = order_a[start:start + block]
+        lo = np.searchsorted(bx, fx[rows].min() - max_width, "left")
+        hi = np.searchsorted(bx, fr[rows].max(), "left")
+        if lo >= hi:
+            continue
+        overlap = ((fx[rows, None] < br[lo:hi]) & (fr[rows, None] > bx[lo:hi]) &
+                   (fy[rows, None] < bb[lo:hi]) & (fb[rows, None] > by[lo:hi]))
+        if exclude_self:
+            overlap &= rows[:, None] != order_b[lo:hi]
+        hits[rows] = overlap.any(axis=1)
+    return hits
+
+
+class VectorKinematics:
+    """
+    Batch movement, stop-line checks, look-ahead collisions and off-screen culling
+    for cars and pedestrians. Car/Pedestrian records are only synced for drawing.
+    """
+    def __init__(self, stop_lines, window_width, window_height):
+        if np is None:
+            raise ImportError("numpy is required for the vectorized backend (pip install numpy)")
+
+        self.window_width = window_width
+        self.window_height = window_height
+        self.stop_lines = stop_lines
+
+        # Car/Pedestrian records, in the same order as the rows of the arrays
+        self.cars = []
+        self.pedestrians = []
+
+        self.car_arrays = EntityArrays({
+            "x": np.float64, "y": np.float64, "w": np.float64, "h": np.float64,
+            "px": np.float64, "py": np.float64,  # position before the last tick
+            "speed": np.float64, "original_speed": np.float64, "base_speed": np.float64,
+            "dir": np.int8, "emergency": bool, "waiting": bool, "age": np.float64, "vid": np.uint32,
+        })
+        self.ped_arrays = EntityArrays({
+            "x": np.float64, "y": np.float64, "w": np.float64, "h": np.float64,
+            "px": np.float64, "py": np.float64,
+            "speed": np.float64, "original_speed": np.float64,
+            "dir": np.int8, "anim_state": np.int8, "anim_timer": np.float64,
+        })
+
+    def add_car(self, car):
+        r = car.rect
+        self.cars.append(car)
+        self.car_arrays.append(x=r.x, y=r.y, w=r.w, h=r.h, px=car.prev_x, py=car.prev_y, speed=car.speed,
+                               original_speed=car.original_speed, base_speed=car.base_speed,
+                               dir=DIRECTION_CODES[car.direction], emergency=car.is_emergency,
+                               waiting=False, age=0, vid=car.vehicle_id)
+
+    def add_pedestrian(self, pedestrian):
+        r = pedestrian.rect
+        self.pedestrians.append(pedestrian)
+        self.ped_arrays.append(x=r.x, y=r.y, w=r.w, h=r.h, px=pedestrian.prev_x, py=pedestrian.prev_y,
+                               speed=pedestrian.speed,
+                               original_speed=pedestrian.original_speed,
+                               dir=DIRECTION_CODES[pedestrian.direction],
+                               anim_state=PED_STATES.index(pedestrian.animation_state),
+                               anim_timer=pedestrian.animation_timer)
+
+    def _stop_line_hits(self, extra):
+        """True for cars whose front point lies inside their (inflated) stop line"""
+        c = self.car_arrays
+        code = c["dir"]
+        x, y, w, h = c["x"], c["y"], c["w"], c["h"]
+
+        # front point: midtop (N), midbottom (S), midright (E), midleft (W)
+        px = np.where(code == 2, x + w, np.where(code == 3, x, x + w / 2))
+        py = np.where(code == 0, y, np.where(code == 1, y + h, y + h / 2))
+
+        bounds = np.array([
+            (line.x - extra / 2, line.y - extra / 2, line.right + extra / 2, line.bottom + extra / 2)
+            for line in (self.stop_lines[d] for d in DIRECTION_NAMES)
+        ])
+        left, top, right, bottom = bounds[code].T
+        return (px >= left) & (px < right) & (py >= top) & (py < bottom)
+
+    def before_stop_line(self):
+        """True for cars whose center has not passed their stop line (Simulation._before_stop_line)"""
+        c = self.car_arrays
+        code = c["dir"]
+        cx = c["x"] + c["w"] / 2
+        cy = c["y"] + c["h"] / 2
+        line_x = np.array([self.stop_lines[d].centerx for d in DIRECTION_NAMES])[code]
+        line_y = np.array([self.stop_lines[d].centery for d in DIRECTION_NAMES])[code]
+        # N drives up, S down, E right, W left
+        return np.where(code == 0, cy > line_y, np.where(code == 1, cy < line_y,
+                        np.where(code == 2, cx < line_x, cx > line_x)))
+
+    def step_cars(self, env, red_directions, scale=1.0):
+        """
+        Move every car one tick (scale: tick length in Simulation.SPEED_TICK units).
+        Returns (crashed, started_waiting, stopped_waiting) boolean masks so the
+        caller can honk and do the wait accounting for just those cars.
+        """
+        c = self.car_arrays
+        if c.n == 0:
+            empty = np.zeros(0, bool)
+            return empty, empty, empty
+
+        # apply_environment: emergency vehicles slow down less
+        factor = np.minimum(1.0, env.speed_factor + np.where(c["emergency"], 0.15, 0.0))
+        c["original_speed"] = c["base_speed"] * factor
+        speed = np.where(c["speed"] > 0, c["original_speed"], 0.0)
+
+        look = int(20 * env.caution)
+        crashed = (_look_ahead_hits(c, look, c, exclude_self=True) |
+                   _look_ahead_hits(c, look, self.ped_arrays, exclude_self=False))
+
+        extra = int(12 * env.caution)
+        red = np.array([d in red_directions for d in DIRECTION_NAMES])[c["dir"]]
+        at_red_line = ~crashed & self._stop_line_hits(extra) & red
+
+        stop_called = crashed | (at_red_line & ~c["emergency"])
+        # emergency vehicles at a red line neither stop nor resume
+        resume_called = ~crashed & ~at_red_line
+
+        speed = np.where(stop_called, 0.0, np.where(resume_called, c["original_speed"], speed))
+        c["speed"] = speed
+
+        waiting = c["waiting"]
+        started_waiting = stop_called & ~waiting
+        stopped_waiting = resume_called & waiting
+        c["waiting"] = (waiting | started_waiting) & ~stopped_waiting
+
+        code = c["dir"]
+        c["px"] = c["x"]
+        c["py"] = c["y"]
+        distance = speed * scale
+        c["x"] = c["x"] + DX[code] * distance
+        c["y"] = c["y"] + DY[code] * distance
+        c["age"] = c["age"] + scale
+        return crashed, started_waiting, stopped_waiting
+
+    def step_pedestrians(self, scale=1.0):
+        """Stop pedestrians about to walk into a car, animate and move the others"""
+        p = self.ped_arrays
+        if p.n == 0:
+            return
+
+        crashed = _look_ahead_hits(p, 20, self.car_arrays, exclude_self=False)
+        speed = np.where(crashed, 0.0, p["original_speed"])
+        p["speed"] = speed
+
+        # same walk cycle as Pedestrian._update_animation
+        moving = speed != 0
+        timer = np.where(moving, p["anim_timer"] + scale, p["anim_timer"])
+        flip = moving & (timer >= 10)
+        p["anim_timer"] = np.where(flip, 0, timer)
+        state = p["anim_state"]
+        p["anim_state"] = np.where(moving, np.where(flip, PED_NEXT_STATE[state], state), 0)
+
+        code = p["dir"]
+        p["px"] = p["x"]
+        p["py"] = p["y"]
+        distance = speed * scale
+        p["x"] = p["x"] + DX[code] * distance
+        p["y"] = p["y"] + DY[code] * distance
+
+    def _off_screen(self, arrays):
+        x, y = arrays["x"], arrays["y"]
+        return ((x + arrays["w"] < 0) | (x > self.window_width) |
+                (y + arrays["h"] < 0) | (y > self.window_height))
+
+    def cull(self):
+        """Remove entities that left the screen and return (removed_cars, removed_pedestrians)"""
+        gone = self._off_screen(self.car_arrays)
+        removed_cars = [self.cars[i] for i in np.flatnonzero(gone)]
+        if removed_cars:
+            # in place: Simulation.cars is this same list
+            self.cars[:] = [car for car, out in zip(self.cars, gone) if not out]
+            self.car_arrays.keep(~gone)
+
+        gone = self._off_screen(self.ped_arrays)
+        removed_peds = [self.pedestrians[i] for i in np.flatnonzero(gone)]
+        if removed_peds:
+            self.pedestrians[:] = [ped for ped, out in zip(self.pedestrians, gone) if not out]
+            self.ped_arrays.keep(~gone)
+        return removed_cars, removed_peds
+
+    def car_telemetry(self, light_by_direction):
+        """(vehicle ids, center x, center y, speed, light code) columns for every car"""
+        c = self.car_arrays
+        light = np.array([light_by_direction[d] for d in DIRECTION_NAMES], np.uint8)[c["dir"]]
+        return c["vid"], c["x"] + c["w"] / 2, c["y"] + c["h"] / 2, c["speed"], light
+
+    def _sync_car(self, car, x, y, px, py, speed, age):
+        car.rect.topleft = (x, y)
+        car.prev_x, car.prev_y = px, py
+        car.speed = speed
+        if car.is_emergency:
+            car.light_time = age
+
+    def sync_car(self, car):
+        """Copy one car's row back into its record"""
+        i = self.cars.index(car)
+        c = self.car_arrays
+        self._sync_car(car, float(c["x"][i]), float(c["y"][i]), float(c["px"][i]), float(c["py"][i]),
+                       float(c["speed"][i]), float(c["age"][i]))
+
+    def moving(self):
+        """True if any car or pedestrian has a non-zero speed"""
+        return bool(self.car_arrays["speed"].any() or self.ped_arrays["speed"].any())
+
+    def sync_sprites(self):
+        """Copy the arrays back into the Car/Pedestrian records before drawing"""
+        c = self.car_arrays
+        for row in zip(self.cars, c["x"].tolist(), c["y"].tolist(), c["px"].tolist(), c["py"].tolist(),
+                       c["speed"].tolist(), c["age"].tolist()):
+            self._sync_car(*row)
+
+        p = self.ped_arrays
+        for ped, x, y, px, py, speed, state, timer in zip(self.pedestrians, p["x"].tolist(), p["y"].tolist(),
+                                                          p["px"].tolist(), p["py"].tolist(),
+                                                          p["speed"].tolist(), p["anim_state"].tolist(),
+                                                          p["anim_timer"].tolist()):
+            ped.rect.topleft = (x, y)
+            ped.prev_x, ped.prev_y = px, py
+            ped.speed = speed
+            ped.animation_state = PED_STATES[state]
+            ped.animation_timer = timer
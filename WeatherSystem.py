@@ -1,19 +1,23 @@
 # WeatherSystem.py
 import random
-import time
+import SimClock
 from Environment import EnvironmentState
 
 class WeatherSystem:
-    def __init__(self, change_interval=25, transition_sec=10.0, clear_prob=0.40):
+    def __init__(self, change_interval=25, transition_sec=10.0, clear_prob=0.40, clock=None, rng=None):
         """
         change_interval = seconds between weather target changes
         transition_sec  = how long it takes to reach new targets (smooth)
         clear_prob      = probability to go back to clear weather
+        clock           = time source with now() in seconds (wall clock by default)
+        rng             = random.Random (or the random module) the targets are drawn from
         """
+        self.clock = clock if clock is not None else SimClock.WALL_CLOCK
+        self.rng = rng if rng is not None else random
         self.env = EnvironmentState()
         self.env.recompute()
 
-        self.last_change = time.time()
+        self.last_change = self.clock.now()
         self.change_interval = change_interval
 
         self.transition_sec = transition_sec
@@ -23,37 +27,67 @@ class WeatherSystem:
         self.target_rain = 0.0
         self.target_fog = 0.0
         self.target_time = "day"
+        self.target_changes = 0  # bumped every time new targets are picked
 
     def randomize_targets(self):
+        rng = self.rng
         # ✅ 40% chance: clear weather
-        if random.random() < self.clear_prob:
+        if rng.random() < self.clear_prob:
             self.target_rain = 0.0
             self.target_fog = 0.0
             # sometimes change time even in clear weather
-            if random.random() < 0.15:
-                self.target_time = random.choice(["day", "dusk", "night"])
+            if rng.random() < 0.15:
+                self.target_time = rng.choice(["day", "dusk", "night"])
             else:
                 self.target_time = self.env.time_of_day
             return
 
         # otherwise: random weather (mild most of the time)
-        if random.random() < 0.25:
-            self.target_time = random.choice(["day", "dusk", "night"])
+        if rng.random() < 0.25:
+            self.target_time = rng.choice(["day", "dusk", "night"])
 
         def mild_intensity():
             # mostly low, sometimes heavy
-            if random.random() < 0.15:
-                return random.uniform(0.6, 1.0)
-            return random.uniform(0.0, 0.5)
+            if rng.random() < 0.15:
+                return rng.uniform(0.6, 1.0)
+            return rng.uniform(0.0, 0.5)
 
         self.target_rain = mild_intensity()
 
         # fog more likely at dusk/night
         if self.target_time in ("dusk", "night"):
-            self.target_fog = min(1.0, mild_intensity() + random.uniform(0.1, 0.3))
+            self.target_fog = min(1.0, mild_intensity() + rng.uniform(0.1, 0.3))
         else:
             self.target_fog = mild_intensity()
 
+    def change_due(self, now=None):
+        now = self.clock.now() if now is None else now
+        return now - self.last_change >= self.change_interval
+
+    def next_change(self):
+        """Clock time at which new targets will be picked"""
+        return self.last_change + self.change_interval
+
+    def retarget(self):
+        """Pick new random targets now"""
+        self.randomize_targets()
+        self.target_changes += 1
+        self.last_change = self.clock.now()
+
+    def settled(self):
+        """True once the weather has reached its targets (update() then changes nothing)"""
+        env = self.env
+        return (env.rain == self.target_rain and env.fog == self.target_fog
+                and env.time_of_day == self.target_time)
+
+    def set_targets(self, rain, fog, time_of_day):
+        """Use given targets (e.g. from a recording) instead of random ones"""
+        self.target_rain = rain
+        self.target_fog = fog
+        self.target_time = time_of_day
+        self.target_changes += 1
+        self.last_change = self.clock.now()
+
     def _approach(self, current, target, dt, rate_per_sec):
         if current < target:
             return min(target, current + rate_per_sec * dt)
@@ -61,13 +95,14 @@ class WeatherSystem:
             return max(target, current - rate_per_sec * dt)
         return current
 
-    def update(self, dt):
-        now = time.time()
-
+    def update(self, dt, poll=True):
+        """
+        Move the weather towards its targets by dt seconds. poll=False leaves picking new
+        targets to the caller (Simulation calls retarget() from its event scheduler).
+        """
         # every X seconds, choose new target weather
-        if now - self.last_change >= self.change_interval:
-            self.randomize_targets()
-            self.last_change = now
+        if poll and self.change_due():
+            self.retarget()
 
         # smooth transitions based on time (not FPS)
         rate = 1.0 / max(0.001, self.transition_sec)
@@ -1,234 +1,125 @@
 from os.path import join
+import argparse
+import json
+import os
 import pygame
 import sys
-import Car
-import Pedestrian
-import TrafficLight
-import TrafficLightController
+import functools
 import random
-import time
-from Button import Button
-from WeatherSystem import WeatherSystem
+import Batch
+import Benchmark
+import Simulation
+import Recording
+import Assets
+import Audio
+import Settings
+from Button import Button, render_text
 from Environment import WeatherRenderer
-
-pygame.init()
-pygame.mixer.init()
+from Profiler import PhaseProfiler, ProfilerHUD
+from Renderer import SceneRenderer
 
 # Global display and font settings
 SCREEN_WIDTH = 600
 SCREEN_HEIGHT = 600
-SCREEN = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
-pygame.display.set_caption("Traffic Simulation")
-
-# Load background for menu
-BG = pygame.image.load(join('assets', 'background.png'))
-BG = pygame.transform.scale(BG, (SCREEN_WIDTH, SCREEN_HEIGHT))
+SCREEN = None     # menu window, opened by init_gui()
+BG = None         # menu background
+PRELOADER = None  # Assets.Preloader started by init_gui()
 
 LAST_STATS = None
-USER_SETTINGS = {
-    "traffic": "Normal",         # Low / Normal / High / Rush Hour
-    "driving": "Normal",         # Cautious / Normal / Aggressive
-    "pedestrians": "Normal",     # Rare / Normal / Busy
-    "weather": "Changing",       # Stable / Changing / Chaotic
-}
-CONFIG = {
-    # Car spawn
-    "car_spawn_min": 1.0,
-    "car_spawn_max": 3.0,
-
-    # Ped spawn
-    "ped_spawn_min": 3.0,
-    "ped_spawn_max": 6.0,
-
-    # Car speed
-    "car_speed_min": 1.0,
-    "car_speed_max": 3.0,
-
-    # Ped speed
-    "ped_speed_min": 0.5,
-    "ped_speed_max": 1.5,
-
-    # Spawn spacing
-    "spawn_min_distance": 100,
-
-    # Weather
-    "weather_change_interval": 25,   # seconds
-}
-
-
+LAST_PROFILE = None  # per-phase ms summary of the last run, if it was profiled (F3)
+PROFILE_CSV = join(Settings.OUTPUT_DIR, "last_run_profile.csv")
+LAST_RECORDING = join(Settings.OUTPUT_DIR, "last_run.trr")  # every run is recorded here and can be replayed (--replay)
+# The window draws RENDER_FPS frames a second; the engine always steps 1 / PHYSICS_HZ seconds,
+# as many times as the elapsed time holds, so the stats do not depend on the frame rate
+PHYSICS_HZ = 60
+RENDER_FPS = 60
+MAX_FRAME_TIME = 0.25  # a longer frame (window dragged, slow machine) is not caught up
+USER_SETTINGS = dict(Settings.DEFAULT_SETTINGS)
+CONFIG = dict(Settings.DEFAULT_CONFIG)
+
+
+@functools.lru_cache(maxsize=None)
 def get_font(size):
-    """Load and return a font of specified size"""
+    """Load and return a font of specified size (loaded once per size)"""
     return pygame.font.Font(join('assets', 'fonts', 'font.ttf'), size)
-def spawn_random_car(window_width, window_height):
-    direction = random.choice(['N', 'S', 'E', 'W'])
-    speed = random.uniform(CONFIG["car_speed_min"], CONFIG["car_speed_max"])
-    return Car.Car(window_width, window_height, speed, direction)
-def spawn_test_pedestrian(window_width, window_height):
-    direction = random.choice(['N', 'S', 'E', 'W'])
-    speed = random.uniform(CONFIG["ped_speed_min"], CONFIG["ped_speed_max"])
-    return Pedestrian.Pedestrian(window_width, window_height, speed, direction)
-def is_spawn_position_clear(new_car, existing_cars, min_distance=100):
-    """Check if spawn position has enough space"""
-    for car in existing_cars:
-        if car.direction != new_car.direction:
-            continue
-
-        if new_car.direction in ["N", "S"]:
-            distance = abs(car.rect.centery - new_car.rect.centery)
-        else:
-            distance = abs(car.rect.centerx - new_car.rect.centerx)
-
-        if distance < min_distance:
-            return False
-
-    return True
 def apply_user_settings():
-    t = USER_SETTINGS["traffic"]
-    d = USER_SETTINGS["driving"]
-    p = USER_SETTINGS["pedestrians"]
-    w = USER_SETTINGS["weather"]
-
-    # --- Traffic density ---
-    if t == "Low":
-        CONFIG["car_spawn_min"], CONFIG["car_spawn_max"] = 2.5, 4.5
-        CONFIG["spawn_min_distance"] = 140
-    elif t == "Normal":
-        CONFIG["car_spawn_min"], CONFIG["car_spawn_max"] = 1.0, 3.0
-        CONFIG["spawn_min_distance"] = 100
-    elif t == "High":
-        CONFIG["car_spawn_min"], CONFIG["car_spawn_max"] = 0.6, 1.5
-        CONFIG["spawn_min_distance"] = 85
-    else:  # Rush Hour
-        CONFIG["car_spawn_min"], CONFIG["car_spawn_max"] = 0.35, 0.9
-        CONFIG["spawn_min_distance"] = 75
-
-    # --- Driving style ---
-    if d == "Cautious":
-        CONFIG["car_speed_min"], CONFIG["car_speed_max"] = 0.8, 2.0
-    elif d == "Normal":
-        CONFIG["car_speed_min"], CONFIG["car_speed_max"] = 1.0, 3.0
-    else:  # Aggressive
-        CONFIG["car_speed_min"], CONFIG["car_speed_max"] = 1.8, 4.0
-
-    # --- Pedestrian activity ---
-    if p == "Rare":
-        CONFIG["ped_spawn_min"], CONFIG["ped_spawn_max"] = 7.0, 12.0
-    elif p == "Normal":
-        CONFIG["ped_spawn_min"], CONFIG["ped_spawn_max"] = 3.0, 6.0
-    else:  # Busy
-        CONFIG["ped_spawn_min"], CONFIG["ped_spawn_max"] = 1.5, 3.5
-
-    # --- Weather variability ---
-    if w == "Stable":
-        CONFIG["weather_change_interval"] = 60
-    elif w == "Changing":
-        CONFIG["weather_change_interval"] = 25
-    else:  # Chaotic
-        CONFIG["weather_change_interval"] = 10
-def is_entity_off_screen(entity, window_width, window_height):
-    """Check if an entity (car or pedestrian) has left the screen"""
-    return (entity.rect.right < 0 or entity.rect.left > window_width or
-            entity.rect.bottom < 0 or entity.rect.top > window_height)
-def initialize_simulation(window_width, window_height):
-    """Initialize all simulation components"""
-    # Traffic lights
-    traffic_light_south = TrafficLight.TrafficLight(window_width, window_height, 'S')
-    traffic_light_north = TrafficLight.TrafficLight(window_width, window_height, 'N')
-    traffic_light_east = TrafficLight.TrafficLight(window_width, window_height, 'E')
-    traffic_light_west = TrafficLight.TrafficLight(window_width, window_height, 'W')
-
-    # Load line image
-    line_image = pygame.image.load(join('assets', 'line.png'))
-
-    line_north = line_image.get_frect(center=(window_width / 2, window_height / 2 + 100))
-    line_south = line_image.get_frect(center=(window_width / 2, window_height / 2 - 100))
-
-    line_image_vertical = pygame.transform.rotate(line_image, 90)
-    line_east = line_image_vertical.get_frect(center=(window_width / 2 - 90, window_height / 2))
-    line_west = line_image_vertical.get_frect(center=(window_width / 2 + 90, window_height / 2))
-
-    stop_lines = {
-        "N": line_north,
-        "S": line_south,
-        "E": line_east,
-        "W": line_west
-    }
-
-    traffic_lights = {
-        "N": traffic_light_north,
-        "S": traffic_light_south,
-        "E": traffic_light_east,
-        "W": traffic_light_west
-    }
-
-    controller = TrafficLightController.TrafficLightController(
-        traffic_light_north,
-        traffic_light_south,
-        traffic_light_east,
-        traffic_light_west
-    )
-
-    return {
-        'traffic_lights': traffic_lights,
-        'stop_lines': stop_lines,
-        'controller': controller,
-        'line_image': line_image,
-        'line_image_vertical': line_image_vertical,
-        'line_north': line_north,
-        'line_south': line_south,
-        'line_east': line_east,
-        'line_west': line_west,
-        'traffic_light_north': traffic_light_north,
-        'traffic_light_south': traffic_light_south,
-        'traffic_light_east': traffic_light_east,
-        'traffic_light_west': traffic_light_west
-    }
-def run_simulation():
-    """Run the traffic simulation"""
+    Settings.build_config(USER_SETTINGS, CONFIG)
+def init_gui():
+    """Open the window and the audio device and start preloading the assets (gui only)"""
+    global SCREEN, BG, PRELOADER
+    pygame.init()
+    pygame.mixer.init()
+    SCREEN = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    pygame.display.set_caption("Traffic Simulation")
+
+    # Decode every image and sound in the background while the menu is up;
+    # START is enabled once they are all resident (see show_menu)
+    PRELOADER = Assets.Preloader().start()
+
+    # Load background for menu
+    BG = Assets.surface(join('assets', 'Background.png'))
+    BG = pygame.transform.scale(BG, (SCREEN_WIDTH, SCREEN_HEIGHT)).convert()
+def run_simulation(replay_path=None):
+    """Run the traffic simulation, or replay a recorded run tick for tick"""
     # Load background
-    background = pygame.image.load(join('assets', 'intersection.png'))
+    background = Assets.surface(join('assets', 'intersection.png'))
     window_width, window_height = background.get_width(), background.get_height()
     global CONFIG
     # Create a new display for simulation
     sim_display = pygame.display.set_mode((window_width, window_height))
-    weather_system = WeatherSystem(change_interval=CONFIG["weather_change_interval"])
     weather_fx = WeatherRenderer(window_width, window_height)
 
     pygame.display.set_caption("Traffic Simulation - Press ESC to return to menu")
 
-    # Initialize simulation components
-    sim_data = initialize_simulation(window_width, window_height)
+    # A replay brings its own settings and tick lengths; a live run is recorded
+    replay = Recording.load(replay_path) if replay_path else None
+    recorder = None
+    physics_dt = 1.0 / PHYSICS_HZ
+    sim_width, sim_height, backend = window_width, window_height, "objects"
+    if replay:
+        # same world and backend as the recorded run (the backends can differ by a tick)
+        config, seed = replay.config, replay.seed
+        (sim_width, sim_height), backend = replay.size, replay.backend
+        if replay.size != (window_width, window_height):
+            print(f"Replay recorded on a {sim_width}x{sim_height} world; "
+                  f"only the {window_width}x{window_height} window is shown")
+        replay_dts = replay.dts()
+    else:
+        config, seed = CONFIG, random.randrange(2 ** 32)
+        recorder = Recording.Recorder(seed, config, (window_width, window_height))
+
+    # Horns and sirens, heard from the middle of the intersection
+    audio = Audio.AudioManager(listener=(window_width / 2, window_height / 2))
+
+    # Initialize simulation engine (spawning, lights, weather, collisions)
+    sim = Simulation.Simulation(sim_width, sim_height, config, backend=backend, seed=seed,
+                                recorder=recorder, replay=replay, audio=audio)
+    renderer = SceneRenderer(sim_display, background, sim.sim_data)
 
     # Load and scale finish button image
-    finish_img = pygame.transform.scale(pygame.image.load("assets/Quit Rect.png"), (120, 50))
-
-    # Game state
-    cars = []
-    pedestrians = []
-    last_spawn_time = time.time()
-    spawn_interval = random.uniform(CONFIG["car_spawn_min"], CONFIG["car_spawn_max"])
-    last_pedestrian_spawn_time = time.time()
-    pedestrian_spawn_interval = random.uniform(CONFIG["ped_spawn_min"], CONFIG["ped_spawn_max"])
-    running = True
-    clock = pygame.time.Clock()
-
-    global LAST_STATS
-    sim_start_time = time.time()
+    finish_img = pygame.transform.scale(Assets.surface(join('assets', 'Quit Rect.png')), (120, 50))
+    finish_button = Button(image=finish_img, pos=(window_width - 70, 30),
+                           text_input="FINISH", font=get_font(20), base_color="#d7fcd4", hovering_color="White")
 
-    cars_crossed = 0
-    peds_crossed = 0
+    # Frame-phase profiling, toggled with F3 (when off the engine and renderer skip every timer)
+    profiler = PhaseProfiler()
+    hud = ProfilerHUD(profiler, pygame.font.Font(None, 18), pos=(8, 8))
+    profiling = False
 
-    # per-car wait tracking without editing Car.py
-    car_wait = {}  # key: id(car) -> {'wait_total':0, 'stopped':False, 'stop_started':0}
+    running = True
+    clock = pygame.time.Clock()
+    env = sim.env
+    accumulator = 0.0  # real time not simulated yet
+    dt = next(replay_dts, None) if replay else physics_dt  # length of the next tick
+    last_dt = dt  # length of the tick stepped last (the one sprites are interpolated across)
 
-    # Spawn initial test pedestrian
-    test_pedestrian = spawn_test_pedestrian(window_width, window_height)
-    pedestrians.append(test_pedestrian)
-    print(f"Spawned test pedestrian! Direction: {test_pedestrian.direction}")
+    global LAST_STATS, LAST_PROFILE
 
     # Main simulation loop
-    while running:
-        dt = clock.tick(60) / 1000.0
+    while running and dt is not None:
+        accumulator += min(clock.tick(RENDER_FPS) / 1000.0, MAX_FRAME_TIME)
+        if profiling:
+            profiler.begin()
 
         MOUSE_POS = pygame.mouse.get_pos()
 
@@ -239,186 +130,53 @@ def run_simulation():
             if event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_ESCAPE:
                     running = False
+                if event.key == pygame.K_F3:
+                    profiling = not profiling
+                    sim.profiler = renderer.profiler = profiler if profiling else None
+                    profiler.begin()
             if event.type == pygame.MOUSEBUTTONDOWN:
                 # Check if finish button is clicked
-                finish_button = Button(image=finish_img, pos=(window_width - 70, 30),
-                                       text_input="FINISH", font=get_font(30), base_color="#d7fcd4",
-                                       hovering_color="White")
                 if finish_button.checkForInput(MOUSE_POS):
                     running = False
-        env = weather_system.update(dt)
-
-        # Spawn new cars randomly
-        current_time = time.time()
-        if current_time - last_spawn_time >= spawn_interval:
-            new_car = spawn_random_car(window_width, window_height)
-
-            if is_spawn_position_clear(new_car, cars, min_distance=CONFIG["spawn_min_distance"]):
-                cars.append(new_car)
-                car_wait[id(new_car)] = {"wait_total": 0.0, "stopped": False, "stop_started": 0.0}
-                print(f"Spawned car! Total cars: {len(cars)}")
-            else:
-                print("Spawn blocked - car already at spawn position")
-
-            last_spawn_time = current_time
-            spawn_interval = random.uniform(CONFIG["car_spawn_min"], CONFIG["car_spawn_max"])
-
-        # Spawn new pedestrians randomly
-        if current_time - last_pedestrian_spawn_time >= pedestrian_spawn_interval:
-            new_pedestrian = spawn_test_pedestrian(window_width, window_height)
-            pedestrians.append(new_pedestrian)
-            print(f"Spawned pedestrian! Total pedestrians: {len(pedestrians)}")
-
-            last_pedestrian_spawn_time = current_time
-            pedestrian_spawn_interval = random.uniform(CONFIG["ped_spawn_min"], CONFIG["ped_spawn_max"])
-
-
-        # Update controller
-        sim_data['controller'].update()
-
-        # Update and check all cars
-        # Update and check all cars
-        for car in cars:
-            will_crash_car = False
-            will_crash_pedestrian = False
-            car.apply_environment(env)
-            # Check collision with other cars
-            for other_car in cars:
-                look = int(20 * env.caution)
-                if car != other_car and car.will_collide_soon(other_car, look_ahead_distance=look):
-                    will_crash_car = True
-                    break
-
-            # Check collision with pedestrians
-            for pedestrian in pedestrians:
-                look_ped = int(20 * env.caution)
-                if car.will_collide_soon(pedestrian, look_ahead_distance=look_ped):
-                    will_crash_pedestrian = True
-                    break
-
-            if will_crash_car or will_crash_pedestrian:
-                car.stop()
-                car.horn(3)
-                st = car_wait.get(id(car))
-                if st and not st["stopped"]:
-                    st["stopped"] = True
-                    st["stop_started"] = time.time()
-
-            else:
-                current_stop_line = sim_data['stop_lines'][car.direction]
-                current_traffic_light = sim_data['traffic_lights'][car.direction]
-
-                extra = int(12 * env.caution)
-                stop_rect = current_stop_line.inflate(extra, extra)
-                if car.check_stop_line(stop_rect):
-                    if current_traffic_light.get_color() == "red":
-                        if not car.is_emergency:
-                            car.stop()
-                            st = car_wait.get(id(car))
-                            if st and not st["stopped"]:
-                                st["stopped"] = True
-                                st["stop_started"] = time.time()
-
-                    else:
-                        car.resume()
-                        st = car_wait.get(id(car))
-                        if st and st["stopped"]:
-                            st["wait_total"] += time.time() - st["stop_started"]
-                            st["stopped"] = False
-                else:
-                    car.resume()
-                    st = car_wait.get(id(car))
-                    if st and st["stopped"]:
-                        st["wait_total"] += time.time() - st["stop_started"]
-                        st["stopped"] = False
-
-            car.update()
-        # Update and check all pedestrians
-        for pedestrian in pedestrians:
-            will_crash = False
-
-            # Check collision with cars
-            for car in cars:
-                if pedestrian.will_collide_soon(car):
-                    will_crash = True
-                    break
-
-            if will_crash:
-                pedestrian.stop()
-            else:
-                pedestrian.resume()
-
-            pedestrian.update()
-
-        # Remove cars that have left the screen
-        # In the run_simulation() function, replace the car removal line with:
-
-        # Remove cars that have left the screen
-        cars_to_remove = [car for car in cars if is_entity_off_screen(car, window_width, window_height)]
-        for car in cars_to_remove:
-            cars_crossed += 1
-
-            st = car_wait.get(id(car))
-            if st and st["stopped"]:
-                st["wait_total"] += time.time() - st["stop_started"]
-                st["stopped"] = False
-
-            if car.is_emergency:
-                car.stop_siren()
-        cars = [car for car in cars if not is_entity_off_screen(car, window_width, window_height)]
-
-        # Remove pedestrians that have left the screen
-        peds_to_remove = [ped for ped in pedestrians if is_entity_off_screen(ped, window_width, window_height)]
-        peds_crossed += len(peds_to_remove)
-        pedestrians = [ped for ped in pedestrians if not is_entity_off_screen(ped, window_width, window_height)]
-
-        # Draw the game
-        sim_display.blit(background, (0, 0))
-
-        sim_display.blit(sim_data['line_image'], sim_data['line_north'])
-        sim_display.blit(sim_data['line_image'], sim_data['line_south'])
-        sim_display.blit(sim_data['line_image_vertical'], sim_data['line_east'])
-        sim_display.blit(sim_data['line_image_vertical'], sim_data['line_west'])
 
-        # Draw all cars
-        for car in cars:
-            car.draw(sim_display,env)
+        if profiling:
+            profiler.lap("events")
+
+        # Fixed-step physics, whatever the frame rate (a replay's tick lengths come from the log)
+        while dt is not None and accumulator >= dt:
+            accumulator -= dt
+            env = sim.step(dt)
+            last_dt = dt
+            dt = next(replay_dts, None) if replay else physics_dt
+        if dt is None:
+            break
+        sim.sync_sprites()
+        if profiling:
+            profiler.lap("sync")
+        audio.update()
+        if profiling:
+            profiler.lap("audio")
 
-        # Draw all pedestrians
-        for pedestrian in pedestrians:
-            pedestrian.draw(sim_display)
-
-        sim_data['traffic_light_north'].draw(sim_display)
-        sim_data['traffic_light_south'].draw(sim_display)
-        sim_data['traffic_light_east'].draw(sim_display)
-        sim_data['traffic_light_west'].draw(sim_display)
-
-        # Draw finish button
-        finish_button = Button(image=finish_img, pos=(window_width - 70, 30),
-                               text_input="FINISH", font=get_font(20), base_color="#d7fcd4", hovering_color="White")
+        # Draw the game
         finish_button.changeColor(MOUSE_POS)
-        finish_button.update(sim_display)
-        weather_fx.draw(sim_display, env)
-        pygame.display.update()
+        widgets = [finish_button, hud] if profiling else [finish_button]
+        # sprites are drawn between their last two ticks, as far as the leftover time goes
+        # (a replay's next tick may be longer than the last one: never draw past the current state)
+        alpha = min(1.0, accumulator / last_dt)
+        renderer.draw(sim.cars, sim.pedestrians, env, weather_fx, widgets=widgets, alpha=alpha)
 
-    for car in cars:
-        if getattr(car, "is_emergency", False):
-            car.stop_siren()
+    sim.finish()
 
     pygame.mixer.stop()  # stops any remaining sounds (sirens/horns)
 
-
-    sim_time = time.time() - sim_start_time
-
-    waits = [st["wait_total"] for st in car_wait.values()]
-    avg_car_wait = sum(waits) / len(waits) if waits else 0.0
-
-    LAST_STATS = {
-        "sim_time": sim_time,
-        "cars_crossed": cars_crossed,
-        "peds_crossed": peds_crossed,
-        "avg_car_wait": avg_car_wait
-    }
+    LAST_STATS = sim.get_stats()
+    os.makedirs(Settings.OUTPUT_DIR, exist_ok=True)
+    if recorder:
+        recorder.save(LAST_RECORDING, LAST_STATS)
+    LAST_PROFILE = None
+    if profiler.samples:
+        LAST_PROFILE = profiler.summary()
+        profiler.write_csv(PROFILE_CSV)
 
     # Reset display back to menu size
     SCREEN = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
@@ -432,47 +190,54 @@ def show_settings():
     clock = pygame.time.Clock()
     running = True
 
-    traffic_opts = ["Low", "Normal", "High", "Rush Hour"]
-    driving_opts = ["Cautious", "Normal", "Aggressive"]
-    ped_opts = ["Rare", "Normal", "Busy"]
-    weather_opts = ["Stable", "Changing", "Chaotic"]
+    traffic_opts = Settings.OPTIONS["traffic"]
+    driving_opts = Settings.OPTIONS["driving"]
+    ped_opts = Settings.OPTIONS["pedestrians"]
+    weather_opts = Settings.OPTIONS["weather"]
+    signal_opts = Settings.OPTIONS["signals"]
+
+    font_label = get_font(15)
+    font_val = get_font(15)
+
+    def draw_row(y, label, value):
+        SCREEN.blit(render_text(font_label, label, "White"), (20, y))
+        SCREEN.blit(render_text(font_val, value, "#d7fcd4"), (330, y))
+
+    y0 = 160
+
+    # arrows for each row
+    left1  = Button(None, (280, y0+10),  "<", get_font(30), "#d7fcd4", "White")
+    right1 = Button(None, (520, y0+10),  ">", get_font(30), "#d7fcd4", "White")
+
+    left2  = Button(None, (280, y0+70),  "<", get_font(30), "#d7fcd4", "White")
+    right2 = Button(None, (520, y0+70),  ">", get_font(30), "#d7fcd4", "White")
+
+    left3  = Button(None, (280, y0+130), "<", get_font(30), "#d7fcd4", "White")
+    right3 = Button(None, (520, y0+130), ">", get_font(30), "#d7fcd4", "White")
+
+    left4  = Button(None, (280, y0+190), "<", get_font(30), "#d7fcd4", "White")
+    right4 = Button(None, (520, y0+190), ">", get_font(30), "#d7fcd4", "White")
+
+    left5  = Button(None, (280, y0+250), "<", get_font(30), "#d7fcd4", "White")
+    right5 = Button(None, (520, y0+250), ">", get_font(30), "#d7fcd4", "White")
+
+    back_button = Button(None, (SCREEN_WIDTH/2, 540), "BACK", get_font(55), "#d7fcd4", "White")
+
+    buttons = [left1,right1,left2,right2,left3,right3,left4,right4,left5,right5,back_button]
 
     while running:
         SCREEN.blit(BG, (0, 0))
         MOUSE_POS = pygame.mouse.get_pos()
 
-        SCREEN.blit(get_font(50).render("SETTINGS", True, "White"),
+        SCREEN.blit(render_text(get_font(50), "SETTINGS", "White"),
                     (SCREEN_WIDTH/2-190, 60))
 
-        font_label = get_font(15)
-        font_val = get_font(15)
-
-        def draw_row(y, label, value):
-            SCREEN.blit(font_label.render(label, True, "White"), (20, y))
-            SCREEN.blit(font_val.render(value, True, "#d7fcd4"), (330, y))
-
-        y0 = 160
         draw_row(y0,     "Traffic density", USER_SETTINGS["traffic"])
         draw_row(y0+60,  "Driving style",   USER_SETTINGS["driving"])
         draw_row(y0+120, "Pedestrians",     USER_SETTINGS["pedestrians"])
         draw_row(y0+180, "Weather",         USER_SETTINGS["weather"])
+        draw_row(y0+240, "Signals",         USER_SETTINGS["signals"])
 
-        # arrows for each row
-        left1  = Button(None, (280, y0+10),  "<", get_font(30), "#d7fcd4", "White")
-        right1 = Button(None, (520, y0+10),  ">", get_font(30), "#d7fcd4", "White")
-
-        left2  = Button(None, (280, y0+70),  "<", get_font(30), "#d7fcd4", "White")
-        right2 = Button(None, (520, y0+70),  ">", get_font(30), "#d7fcd4", "White")
-
-        left3  = Button(None, (280, y0+130), "<", get_font(30), "#d7fcd4", "White")
-        right3 = Button(None, (520, y0+130), ">", get_font(30), "#d7fcd4", "White")
-
-        left4  = Button(None, (280, y0+190), "<", get_font(30), "#d7fcd4", "White")
-        right4 = Button(None, (520, y0+190), ">", get_font(30), "#d7fcd4", "White")
-
-        back_button = Button(None, (SCREEN_WIDTH/2, 540), "BACK", get_font(55), "#d7fcd4", "White")
-
-        buttons = [left1,right1,left2,right2,left3,right3,left4,right4,back_button]
         for b in buttons:
             b.changeColor(MOUSE_POS)
             b.update(SCREEN)
@@ -503,6 +268,11 @@ def show_settings():
                 if right4.checkForInput(MOUSE_POS):
                     USER_SETTINGS["weather"] = cycle_option(USER_SETTINGS["weather"], weather_opts, +1)
 
+                if left5.checkForInput(MOUSE_POS):
+                    USER_SETTINGS["signals"] = cycle_option(USER_SETTINGS["signals"], signal_opts, -1)
+                if right5.checkForInput(MOUSE_POS):
+                    USER_SETTINGS["signals"] = cycle_option(USER_SETTINGS["signals"], signal_opts, +1)
+
                 # IMPORTANT: apply mapping whenever user changes something
                 apply_user_settings()
 
@@ -521,33 +291,36 @@ def show_stats():
     clock = pygame.time.Clock()
     running = True
 
+    title_font = get_font(50)
+    text_font = get_font(20)
+
+    s = LAST_STATS
+    lines = [
+        f"Simulation time: {s['sim_time']:.1f} s",
+        f"Cars crossed: {s['cars_crossed']}",
+        f"Pedestrians crossed: {s['peds_crossed']}",
+        f"Average car wait: {s['avg_car_wait']:.2f} s",
+    ]
+    if LAST_PROFILE:
+        lines.append(f"Frame profile: {PROFILE_CSV}")
+
+    back_button = Button(image=None, pos=(SCREEN_WIDTH / 2, 520),
+                         text_input="BACK", font=get_font(50),
+                         base_color="#d7fcd4", hovering_color="White")
+
     while running:
         SCREEN.blit(BG, (0, 0))
         MOUSE_POS = pygame.mouse.get_pos()
 
-        title_font = get_font(50)
-        text_font = get_font(20)
-
-        title = title_font.render("STATS", True, "White")
+        title = render_text(title_font, "STATS", "White")
         SCREEN.blit(title, title.get_rect(center=(SCREEN_WIDTH / 2, 80)))
 
-        s = LAST_STATS
-        lines = [
-            f"Simulation time: {s['sim_time']:.1f} s",
-            f"Cars crossed: {s['cars_crossed']}",
-            f"Pedestrians crossed: {s['peds_crossed']}",
-            f"Average car wait: {s['avg_car_wait']:.2f} s",
-        ]
-
         y = 160
         for line in lines:
-            txt = text_font.render(line, True, "White")
+            txt = render_text(text_font, line, "White")
             SCREEN.blit(txt, (70, y))
             y += 45
 
-        back_button = Button(image=None, pos=(SCREEN_WIDTH / 2, 520),
-                             text_input="BACK", font=get_font(50),
-                             base_color="#d7fcd4", hovering_color="White")
         back_button.changeColor(MOUSE_POS)
         back_button.update(SCREEN)
 
@@ -562,32 +335,58 @@ def show_stats():
 
         pygame.display.update()
         clock.tick(60)
+def draw_loading(progress):
+    """Progress bar of the asset preloading, under the menu buttons"""
+    bar = pygame.Rect(SCREEN_WIDTH / 2 - 150, SCREEN_HEIGHT - 60, 300, 14)
+    pygame.draw.rect(SCREEN, "#555555", bar, 2)
+    pygame.draw.rect(SCREEN, "#d7fcd4", (bar.x + 3, bar.y + 3, (bar.width - 6) * progress, bar.height - 6))
+    text = render_text(get_font(12), f"LOADING {int(progress * 100)}%", "#d7fcd4")
+    SCREEN.blit(text, text.get_rect(center=(SCREEN_WIDTH / 2, bar.y - 14)))
+
+
 def show_menu():
     """Display the main menu"""
     clock = pygame.time.Clock()
     running = True
 
+    # Create buttons once (START and STATS are rebuilt when they become available)
+    start_button = None
+    start_available = None
+
+    settings_button = Button(image=None, pos=(SCREEN_WIDTH / 2, SCREEN_HEIGHT / 2 - 80),
+                             text_input="SETTINGS", font=get_font(60),
+                             base_color="#d7fcd4", hovering_color="White")
+
+    quit_button = Button(image=None, pos=(SCREEN_WIDTH / 2, SCREEN_HEIGHT / 2 + 90),
+                         text_input="QUIT", font=get_font(75), base_color="#d7fcd4",
+                         hovering_color="White")
+
+    stats_button = None
+    stats_available = None
+
     while running:
         MOUSE_POS = pygame.mouse.get_pos()
 
         SCREEN.blit(BG, (0, 0))
 
-        # Create buttons
-        start_button = Button(image=None, pos=(SCREEN_WIDTH / 2, SCREEN_HEIGHT / 2 - 160),
-                              text_input="START", font=get_font(75), base_color="#d7fcd4",
-                              hovering_color="White")
-
-        stats_button = Button(image=None, pos=(SCREEN_WIDTH / 2, SCREEN_HEIGHT / 2),
-                              text_input="STATS", font=get_font(75),
-                              base_color="#d7fcd4" if LAST_STATS else "#555555",
-                              hovering_color="White")
-        settings_button = Button(image=None, pos=(SCREEN_WIDTH / 2, SCREEN_HEIGHT / 2 - 80),
-                                 text_input="SETTINGS", font=get_font(60),
-                                 base_color="#d7fcd4", hovering_color="White")
-
-        quit_button = Button(image=None, pos=(SCREEN_WIDTH / 2, SCREEN_HEIGHT / 2 + 90),
-                             text_input="QUIT", font=get_font(75), base_color="#d7fcd4",
-                             hovering_color="White")
+        # Convert the decoded assets on this thread as soon as the worker is done
+        if not PRELOADER.resident and PRELOADER.decoded():
+            PRELOADER.finish()
+        if start_available != PRELOADER.resident:
+            start_available = PRELOADER.resident
+            start_button = Button(image=None, pos=(SCREEN_WIDTH / 2, SCREEN_HEIGHT / 2 - 160),
+                                  text_input="START", font=get_font(75),
+                                  base_color="#d7fcd4" if start_available else "#555555",
+                                  hovering_color="White")
+        if not start_available:
+            draw_loading(PRELOADER.progress())
+
+        if stats_available != bool(LAST_STATS):
+            stats_available = bool(LAST_STATS)
+            stats_button = Button(image=None, pos=(SCREEN_WIDTH / 2, SCREEN_HEIGHT / 2),
+                                  text_input="STATS", font=get_font(75),
+                                  base_color="#d7fcd4" if LAST_STATS else "#555555",
+                                  hovering_color="White")
 
         # Draw buttons
         start_button.changeColor(MOUSE_POS)
@@ -606,7 +405,7 @@ def show_menu():
             if event.type == pygame.MOUSEBUTTONDOWN:
                 if LAST_STATS and stats_button.checkForInput(MOUSE_POS):
                     show_stats()
-                if start_button.checkForInput(MOUSE_POS):
+                if start_available and start_button.checkForInput(MOUSE_POS):
                     run_simulation()
                 if settings_button.checkForInput(MOUSE_POS):
                     show_settings()
@@ -618,6 +417,60 @@ def show_menu():
         clock.tick(60)
 
 
-if __name__ == "__main__":
+def main(argv=None):
+    global PHYSICS_HZ, RENDER_FPS
+    parser = argparse.ArgumentParser(description="Traffic intersection simulation")
+    commands = parser.add_subparsers(dest="command", metavar="{gui,headless,batch,bench}")
+
+    gui = commands.add_parser("gui", help="menu and simulation window (default)")
+    gui.add_argument("--replay", metavar="TRR", help="replay a recorded run in the window")
+    gui.add_argument("--physics-hz", type=float, default=PHYSICS_HZ, help="engine ticks per second")
+    gui.add_argument("--fps", type=float, default=RENDER_FPS, help="frames drawn per second")
+
+    headless = commands.add_parser("headless", help="one run without a window, stats printed as JSON")
+    headless.add_argument("--duration", type=float, default=600, help="simulated seconds")
+    headless.add_argument("--dt", type=float, default=1 / 60, help="seconds per tick")
+    headless.add_argument("--seed", type=int, default=None)
+    headless.add_argument("--backend", choices=["objects", "vector"], default="objects")
+    headless.add_argument("--record", metavar="TRR", help="write a Recording log of the run")
+    headless.add_argument("--telemetry", metavar="DIR", help="write per-tick vehicle telemetry")
+    for key, options in Settings.OPTIONS.items():
+        headless.add_argument(f"--{key}", choices=options, default=Settings.DEFAULT_SETTINGS[key])
+
+    # batch and bench take the options of Batch.py and Benchmark.py (see "main.py batch --help")
+    commands.add_parser("batch", help="seeded replicates over the settings grid", add_help=False)
+    commands.add_parser("bench", help="time the standard scenarios", add_help=False)
+
+    argv = sys.argv[1:] if argv is None else list(argv)
+    if not argv or argv[0] not in commands.choices and argv[0] not in ("-h", "--help"):
+        argv = ["gui"] + argv  # "python main.py [--replay TRR]" opens the window
+    args, rest = parser.parse_known_args(argv)
+
+    if args.command == "batch":
+        Batch.main(rest)
+        return
+    if args.command == "bench":
+        Benchmark.main(rest)
+        return
+    if rest:
+        parser.error(f"unrecognized arguments: {' '.join(rest)}")
+
+    if args.command == "headless":
+        settings = {key: getattr(args, key) for key in Settings.OPTIONS}
+        stats = Simulation.run_headless(Settings.build_config(settings), args.duration, dt=args.dt,
+                                        backend=args.backend, seed=args.seed,
+                                        record=args.record, telemetry=args.telemetry)
+        print(json.dumps(stats, indent=2))
+        return
+
+    PHYSICS_HZ, RENDER_FPS = args.physics_hz, args.fps
+    init_gui()
     apply_user_settings()
-    show_menu()
\ No newline at end of file
+    if args.replay:
+        PRELOADER.finish()
+        run_simulation(replay_path=args.replay)
+    show_menu()
+
+
+if __name__ == "__main__":
+    main()